@@ -2,13 +2,28 @@
 分析結果の保存・取得機能
 """
 import os
-import json
 import uuid
-from datetime import datetime, timezone
-from typing import List, Dict, Optional
+import time
+import asyncio
+import tempfile
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Optional, Any, Iterable, Set
 from google.cloud import bigquery
+import orjson
 import logging
 
+# --- BigQuery Storage API（未インストール時は insert_rows_json / REST ページングにフォールバック） ---
+try:
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types as storage_types
+    from google.cloud.bigquery_storage_v1 import writer as storage_writer
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    BQ_STORAGE_AVAILABLE = True
+except ImportError:
+    BQ_STORAGE_AVAILABLE = False
+# --- ここまで ---
+
 logger = logging.getLogger(__name__)
 
 BIGQUERY_ANALYSIS_TABLE = os.getenv(
@@ -16,20 +31,292 @@ BIGQUERY_ANALYSIS_TABLE = os.getenv(
     "apt-rope-217206.researcher_data.researcher_analysis_results"
 )
 
+# ストリーミング挿入のバッファ設定（insertAll の推奨 500行 / 上限 10MB 未満に収める）
+INSERT_CHUNK_SIZE = 500
+FLUSH_MAX_BYTES = 8 * 1024 * 1024
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# get_analyses で取得するカラム
+ANALYSIS_FIELDS = (
+    "analysis_id",
+    "researchmap_url",
+    "researcher_name",
+    "affiliation",
+    "query",
+    "analysis_result",
+    "relevance_score",
+    "created_at",
+    "session_id",
+)
+# get_analyses の結果取得ページサイズ
+RESULT_PAGE_SIZE = 1000
+
+# この件数を超える一括保存はストリーミング挿入ではなくロードジョブで取り込む
+BULK_LOAD_THRESHOLD = 5000
+# ロードジョブ用NDJSONをメモリに保持する上限（超えるとディスクに退避）
+BULK_LOAD_SPOOL_BYTES = 64 * 1024 * 1024
+
+# 分析結果テーブルのスキーマ（Storage Write API の行メッセージ定義にも使用）
+ANALYSIS_TABLE_SCHEMA = [
+    bigquery.SchemaField("analysis_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("researchmap_url", "STRING"),
+    bigquery.SchemaField("researcher_name", "STRING"),
+    bigquery.SchemaField("affiliation", "STRING"),
+    bigquery.SchemaField("query", "STRING"),
+    bigquery.SchemaField("analysis_result", "STRING"),
+    bigquery.SchemaField("relevance_score", "FLOAT64"),
+    bigquery.SchemaField("created_at", "TIMESTAMP"),
+    bigquery.SchemaField("session_id", "STRING"),
+]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _build_row_message_class():
+    """ANALYSIS_TABLE_SCHEMA から Storage Write API 用の proto2 メッセージクラスを生成"""
+    proto_types = {
+        "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+        "FLOAT64": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+        "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,  # エポックからのマイクロ秒
+    }
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name="analysis_row.proto",
+        package="analysis_storage",
+        syntax="proto2"
+    )
+    message_proto = file_proto.message_type.add(name="AnalysisRow")
+    for number, field in enumerate(ANALYSIS_TABLE_SCHEMA, start=1):
+        message_proto.field.add(
+            name=field.name,
+            number=number,
+            type=proto_types[field.field_type],
+            label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+        )
+    
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    descriptor = pool.FindMessageTypeByName("analysis_storage.AnalysisRow")
+    return message_factory.GetMessageClass(descriptor), message_proto
+
 class AnalysisStorage:
     def __init__(self):
         self.client = None
+        self._table_ref = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_bytes = 0
+        self._buffer_started_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        # 実行中のフラッシュタスク（参照を保持しないとイベントループに破棄されるため）
+        self._pending_tasks: Set[asyncio.Task] = set()
+        self._write_client = None
+        self._read_client = None
+        self._append_stream = None
+        self._append_stream_lock = threading.Lock()
+        self._row_message_class = None
+        self._row_message_proto = None
         self._initialize_client()
     
     def _initialize_client(self):
         """BigQueryクライアントの初期化"""
         try:
-            from gcp_auth import get_bigquery_client
+            from gcp_auth import get_bigquery_client, gcp_manager
             self.client = get_bigquery_client()
+            self._table_ref = bigquery.TableReference.from_string(BIGQUERY_ANALYSIS_TABLE)
             logger.info("✅ AnalysisStorage: BigQueryクライアント初期化成功")
         except Exception as e:
             logger.error(f"❌ AnalysisStorage: BigQueryクライアント初期化失敗: {e}")
+            return
+        
+        if not BQ_STORAGE_AVAILABLE:
+            logger.warning("⚠️ AnalysisStorage: BigQuery Storage APIが利用できません - insert_rows_json / RESTで読み書き")
+            return
+        
+        try:
+            self._write_client = bigquery_storage_v1.BigQueryWriteClient(
+                credentials=gcp_manager.credentials
+            )
+            self._row_message_class, self._row_message_proto = _build_row_message_class()
+            logger.info("✅ AnalysisStorage: Storage Write APIクライアント初期化成功")
+        except Exception as e:
+            logger.warning(f"⚠️ AnalysisStorage: Storage Write API初期化失敗 - insert_rows_jsonで保存: {e}")
+            self._write_client = None
+        
+        try:
+            self._read_client = bigquery_storage_v1.BigQueryReadClient(
+                credentials=gcp_manager.credentials
+            )
+            logger.info("✅ AnalysisStorage: Storage Read APIクライアント初期化成功")
+        except Exception as e:
+            logger.warning(f"⚠️ AnalysisStorage: Storage Read API初期化失敗 - RESTページングで取得: {e}")
+            self._read_client = None
     
+    def _build_row(
+        self,
+        researchmap_url: str,
+        researcher_name: str,
+        query: str,
+        analysis_result: dict,
+        relevance_score: Optional[float] = None,
+        affiliation: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """BigQuery挿入用の行データを作成"""
+        return {
+            "analysis_id": str(uuid.uuid4()),
+            "researchmap_url": researchmap_url,
+            "researcher_name": researcher_name,
+            "affiliation": affiliation,
+            "query": query,
+            "analysis_result": orjson.dumps(analysis_result).decode("utf-8"),
+            "relevance_score": relevance_score,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "session_id": session_id
+        }
+
+    @staticmethod
+    def _row_size(row: Dict[str, Any]) -> int:
+        """行のおおよそのリクエストサイズ（バイト）"""
+        return len(orjson.dumps(row))
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """行を 500行 / 8MB 以下のチャンクに分けて挿入（ブロッキング呼び出し）"""
+        errors = []
+        chunk, chunk_bytes = [], 0
+        for row in rows:
+            row_bytes = self._row_size(row)
+            if chunk and (len(chunk) >= INSERT_CHUNK_SIZE or chunk_bytes + row_bytes > FLUSH_MAX_BYTES):
+                errors.extend(self._insert_chunk(chunk))
+                chunk, chunk_bytes = [], 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            errors.extend(self._insert_chunk(chunk))
+        return errors
+
+    def _insert_chunk(self, chunk: List[Dict[str, Any]]) -> List[Any]:
+        """1チャンクを挿入（Storage Write API が使えない場合は insert_rows_json）"""
+        if self._write_client is None:
+            return self.client.insert_rows_json(self._table_ref, chunk)
+        return self._append_rows(chunk)
+
+    def _to_row_message(self, row: Dict[str, Any]):
+        """行データを proto メッセージに変換（None のフィールドは NULL として未設定のまま）"""
+        message = self._row_message_class()
+        for key, value in row.items():
+            if value is None:
+                continue
+            if key == "created_at":
+                value = (datetime.fromisoformat(value) - _EPOCH) // timedelta(microseconds=1)
+            setattr(message, key, value)
+        return message
+
+    def _get_append_stream(self):
+        """_default ストリームへの AppendRows 双方向ストリームを取得（使い回す）"""
+        with self._append_stream_lock:
+            if self._append_stream is None:
+                table = self._table_ref
+                parent = self._write_client.table_path(table.project, table.dataset_id, table.table_id)
+                proto_schema = storage_types.ProtoSchema()
+                proto_descriptor = descriptor_pb2.DescriptorProto()
+                proto_descriptor.CopyFrom(self._row_message_proto)
+                proto_schema.proto_descriptor = proto_descriptor
+                
+                request_template = storage_types.AppendRowsRequest()
+                request_template.write_stream = f"{parent}/streams/_default"
+                proto_data = storage_types.AppendRowsRequest.ProtoData()
+                proto_data.writer_schema = proto_schema
+                request_template.proto_rows = proto_data
+                
+                self._append_stream = storage_writer.AppendRowsStream(self._write_client, request_template)
+            return self._append_stream
+
+    def _reset_append_stream(self):
+        """エラー後にストリームを破棄（次回の挿入で再接続）"""
+        with self._append_stream_lock:
+            if self._append_stream is not None:
+                try:
+                    self._append_stream.close()
+                except Exception as e:
+                    logger.warning(f"⚠️ AppendRowsストリームのクローズに失敗: {e}")
+                self._append_stream = None
+
+    def _append_rows(self, chunk: List[Dict[str, Any]]) -> List[Any]:
+        """Storage Write API の _default ストリームに1チャンクを追記"""
+        proto_rows = storage_types.ProtoRows()
+        for row in chunk:
+            proto_rows.serialized_rows.append(self._to_row_message(row).SerializeToString())
+        
+        request = storage_types.AppendRowsRequest()
+        proto_data = storage_types.AppendRowsRequest.ProtoData()
+        proto_data.rows = proto_rows
+        request.proto_rows = proto_data
+        
+        try:
+            response = self._get_append_stream().send(request).result()
+        except Exception:
+            self._reset_append_stream()
+            raise
+        
+        return [
+            {"index": row_error.index, "message": row_error.message}
+            for row_error in response.row_errors
+        ]
+
+    def close(self):
+        """Storage Write API のストリームを閉じる（flush 後のシャットダウン時に呼び出す）"""
+        self._reset_append_stream()
+
+    def _load_rows(self, rows: Iterable[Dict[str, Any]]) -> List[str]:
+        """行をNDJSONに書き出し、ロードジョブで一括取り込み（ブロッキング呼び出し）"""
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            schema=ANALYSIS_TABLE_SCHEMA
+        )
+        analysis_ids = []
+        with tempfile.SpooledTemporaryFile(max_size=BULK_LOAD_SPOOL_BYTES) as ndjson_file:
+            for row in rows:
+                ndjson_file.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+                analysis_ids.append(row["analysis_id"])
+            
+            if not analysis_ids:
+                return []
+            
+            load_job = self.client.load_table_from_file(
+                ndjson_file,
+                self._table_ref,
+                rewind=True,
+                job_config=job_config
+            )
+            load_job.result()  # 完了を待つ
+        return analysis_ids
+
+    def _fetch_analyses(self, sql_query: str, job_config: bigquery.QueryJobConfig) -> List[Dict]:
+        """
+        クエリを実行し、1パスで辞書に変換（ブロッキング呼び出し）
+        Storage Read API が使える場合はArrowで一括取得し、使えない場合はRESTでページ単位に取得する
+        """
+        query_job = self.client.query(sql_query, job_config=job_config)
+        if self._read_client is not None:
+            rows = query_job.result().to_arrow(bqstorage_client=self._read_client).to_pylist()
+        else:
+            rows = query_job.result(page_size=RESULT_PAGE_SIZE)
+        return [
+            {
+                **{field: row[field] for field in ANALYSIS_FIELDS},
+                # JSON文字列をパース
+                "analysis_result": orjson.loads(row["analysis_result"]) if row["analysis_result"] else row["analysis_result"]
+            }
+            for row in rows
+        ]
+
+    def _execute_dml(self, sql_query: str, job_config: bigquery.QueryJobConfig) -> int:
+        """DMLを実行して影響を受けた行数を返す（ブロッキング呼び出し）"""
+        query_job = self.client.query(sql_query, job_config=job_config)
+        query_job.result()  # 完了を待つ
+        return query_job.num_dml_affected_rows or 0
+
     async def save_analysis(
         self,
         researchmap_url: str,
@@ -40,49 +327,160 @@ class AnalysisStorage:
         affiliation: Optional[str] = None,
         session_id: Optional[str] = None
     ) -> Dict[str, any]:
-        """分析結果を保存"""
+        """
+        分析結果を保存
+        行はバッファに追加され、件数・サイズ・経過時間のいずれかが閾値に達した時点でまとめて挿入される
+        戻り値の status "queued" はバッファへの受け付けを表し、BigQueryへの挿入完了は保証しない
+        （挿入の失敗はフラッシュ時にログへ記録される）
+        """
         try:
-            analysis_id = str(uuid.uuid4())
-            
-            # データの準備
-            row = {
-                "analysis_id": analysis_id,
-                "researchmap_url": researchmap_url,
-                "researcher_name": researcher_name,
-                "affiliation": affiliation,
-                "query": query,
-                "analysis_result": json.dumps(analysis_result, ensure_ascii=False),
-                "relevance_score": relevance_score,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "session_id": session_id
+            row = self._build_row(
+                researchmap_url=researchmap_url,
+                researcher_name=researcher_name,
+                query=query,
+                analysis_result=analysis_result,
+                relevance_score=relevance_score,
+                affiliation=affiliation,
+                session_id=session_id
+            )
+            
+            async with self._lock:
+                if not self._buffer:
+                    self._buffer_started_at = time.monotonic()
+                self._buffer.append(row)
+                self._buffer_bytes += self._row_size(row)
+                should_flush = (
+                    len(self._buffer) >= INSERT_CHUNK_SIZE
+                    or self._buffer_bytes >= FLUSH_MAX_BYTES
+                )
+            
+            if should_flush:
+                self._start_task(self.flush())
+            elif self._flush_task is None or self._flush_task.done():
+                self._flush_task = self._start_task(self._flush_after_interval())
+            
+            logger.info(f"✅ 分析結果を保存キューに追加: {row['analysis_id']}")
+            return {
+                "status": "queued",
+                "analysis_id": row["analysis_id"],
+                "message": "分析結果を保存キューに追加しました"
             }
             
-            # BigQueryに挿入
-            table = self.client.get_table(BIGQUERY_ANALYSIS_TABLE)
-            errors = self.client.insert_rows_json(table, [row])
+        except Exception as e:
+            logger.error(f"❌ 分析結果保存エラー: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def save_analyses_bulk(self, analyses: List[Dict[str, Any]]) -> Dict[str, any]:
+        """
+        複数の分析結果をまとめて保存
+        
+        Args:
+            analyses: save_analysis と同じキーワード引数を持つ辞書のリスト
+        """
+        if len(analyses) > BULK_LOAD_THRESHOLD:
+            return await self.bulk_load(analyses)
+        
+        try:
+            rows = [self._build_row(**analysis) for analysis in analyses]
+            errors = await asyncio.to_thread(self._insert_rows, rows)
             
             if errors:
-                logger.error(f"❌ BigQuery挿入エラー: {errors}")
+                logger.error(f"❌ BigQuery一括挿入エラー: {errors}")
                 return {
                     "status": "error",
                     "message": "保存に失敗しました",
                     "errors": errors
                 }
             
-            logger.info(f"✅ 分析結果保存成功: {analysis_id}")
+            logger.info(f"✅ 分析結果一括保存成功: {len(rows)}件")
             return {
                 "status": "success",
-                "analysis_id": analysis_id,
-                "message": "分析結果を保存しました"
+                "analysis_ids": [row["analysis_id"] for row in rows],
+                "message": f"{len(rows)}件の分析結果を保存しました"
             }
             
         except Exception as e:
-            logger.error(f"❌ 分析結果保存エラー: {e}")
+            logger.error(f"❌ 分析結果一括保存エラー: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def bulk_load(self, analyses: Iterable[Dict[str, Any]]) -> Dict[str, any]:
+        """
+        過去分のバックフィル等、大量の分析結果をロードジョブで一括取り込み
+        ストリーミング挿入のクォータや行単位のHTTPオーバーヘッドを回避する
+        
+        Args:
+            analyses: save_analysis と同じキーワード引数を持つ辞書のイテラブル
+        """
+        try:
+            rows = (self._build_row(**analysis) for analysis in analyses)
+            analysis_ids = await asyncio.to_thread(self._load_rows, rows)
+            
+            logger.info(f"✅ 分析結果ロードジョブ完了: {len(analysis_ids)}件")
+            return {
+                "status": "success",
+                "analysis_ids": analysis_ids,
+                "message": f"{len(analysis_ids)}件の分析結果を保存しました"
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ 分析結果ロードジョブエラー: {e}")
             return {
                 "status": "error",
                 "message": str(e)
             }
     
+    def _start_task(self, coro) -> asyncio.Task:
+        """バックグラウンドタスクを開始し、完了まで参照を保持する"""
+        task = asyncio.create_task(coro)
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+        return task
+    
+    async def _flush_after_interval(self):
+        """最初の行の追加から FLUSH_INTERVAL_SECONDS 経過後にバッファをフラッシュ"""
+        started_at = self._buffer_started_at or time.monotonic()
+        delay = FLUSH_INTERVAL_SECONDS - (time.monotonic() - started_at)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.flush()
+    
+    async def flush(self) -> List[Any]:
+        """バッファ内の行をBigQueryへ挿入（シャットダウン時にも呼び出す）"""
+        async with self._lock:
+            rows = self._buffer
+            self._buffer = []
+            self._buffer_bytes = 0
+            self._buffer_started_at = None
+        
+        if not rows:
+            return []
+        
+        try:
+            errors = await asyncio.to_thread(self._insert_rows, rows)
+        except Exception as e:
+            logger.error(f"❌ 分析結果フラッシュエラー: {e}")
+            return [{"message": str(e)}]
+        
+        if errors:
+            logger.error(f"❌ BigQuery挿入エラー: {errors}")
+        else:
+            logger.info(f"✅ 分析結果保存成功: {len(rows)}件")
+        return errors
+    
+    async def shutdown(self) -> List[Any]:
+        """実行中のフラッシュを待ち、バッファに残った行を挿入してからストリームを閉じる"""
+        if self._pending_tasks:
+            await asyncio.gather(*self._pending_tasks, return_exceptions=True)
+        errors = await self.flush()
+        self.close()
+        return errors
+    
     async def get_analyses(
         self,
         session_id: Optional[str] = None,
@@ -93,39 +491,30 @@ class AnalysisStorage:
         try:
             # クエリ構築
             conditions = []
+            query_parameters = [bigquery.ScalarQueryParameter("limit", "INT64", limit)]
             if session_id:
-                conditions.append(f"session_id = '{session_id}'")
+                conditions.append("session_id = @session_id")
+                query_parameters.append(bigquery.ScalarQueryParameter("session_id", "STRING", session_id))
             if query:
-                conditions.append(f"query LIKE '%{query}%'")
+                conditions.append("CONTAINS_SUBSTR(query, @query)")
+                query_parameters.append(bigquery.ScalarQueryParameter("query", "STRING", query))
             
             where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
             
             sql_query = f"""
-            SELECT 
-                analysis_id,
-                researchmap_url,
-                researcher_name,
-                affiliation,
-                query,
-                analysis_result,
-                relevance_score,
-                created_at,
-                session_id
+            SELECT {', '.join(ANALYSIS_FIELDS)}
             FROM `{BIGQUERY_ANALYSIS_TABLE}`
             {where_clause}
             ORDER BY created_at DESC
-            LIMIT {limit}
+            LIMIT @limit
             """
             
-            query_job = self.client.query(sql_query)
-            results = []
-            
-            for row in query_job:
-                result = dict(row)
-                # JSON文字列をパース
-                if result.get('analysis_result'):
-                    result['analysis_result'] = json.loads(result['analysis_result'])
-                results.append(result)
+            # パラメータ化によりSQL文字列が固定され、同一条件ではクエリキャッシュが効く
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=query_parameters,
+                use_query_cache=True
+            )
+            results = await asyncio.to_thread(self._fetch_analyses, sql_query, job_config)
             
             logger.info(f"✅ {len(results)}件の分析結果を取得")
             return results
@@ -137,37 +526,27 @@ class AnalysisStorage:
     async def delete_analysis(self, analysis_id: str, session_id: str) -> Dict[str, any]:
         """分析結果を削除（セッション確認付き）"""
         try:
-            # まず所有権を確認
-            check_query = f"""
-            SELECT session_id 
-            FROM `{BIGQUERY_ANALYSIS_TABLE}`
-            WHERE analysis_id = '{analysis_id}'
+            # 所有権の確認と削除を1回のDMLで実行
+            delete_query = f"""
+            DELETE FROM `{BIGQUERY_ANALYSIS_TABLE}`
+            WHERE analysis_id = @analysis_id
+              AND session_id = @session_id
             """
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("analysis_id", "STRING", analysis_id),
+                    bigquery.ScalarQueryParameter("session_id", "STRING", session_id),
+                ]
+            )
             
-            query_job = self.client.query(check_query)
-            results = list(query_job)
+            deleted_count = await asyncio.to_thread(self._execute_dml, delete_query, job_config)
             
-            if not results:
+            if deleted_count == 0:
                 return {
                     "status": "error",
-                    "message": "分析結果が見つかりません"
-                }
-            
-            if results[0].session_id != session_id:
-                return {
-                    "status": "error", 
-                    "message": "削除権限がありません"
+                    "message": "分析結果が見つからないか、削除権限がありません"
                 }
             
-            # 削除実行
-            delete_query = f"""
-            DELETE FROM `{BIGQUERY_ANALYSIS_TABLE}`
-            WHERE analysis_id = '{analysis_id}'
-            """
-            
-            query_job = self.client.query(delete_query)
-            query_job.result()  # 完了を待つ
-            
             logger.info(f"✅ 分析結果削除成功: {analysis_id}")
             return {
                 "status": "success",
@@ -180,3 +559,19 @@ class AnalysisStorage:
                 "status": "error",
                 "message": str(e)
             }
+
+
+# アプリ全体で共有するインスタンス（BigQueryクライアントの初期化を伴うため初回利用時に生成）
+_shared_storage: Optional[AnalysisStorage] = None
+
+def get_analysis_storage() -> AnalysisStorage:
+    """共有の AnalysisStorage を取得"""
+    global _shared_storage
+    if _shared_storage is None:
+        _shared_storage = AnalysisStorage()
+    return _shared_storage
+
+async def shutdown_analysis_storage():
+    """共有インスタンスのバッファを書き出して閉じる（生成済みの場合のみ。アプリ終了時に呼び出す）"""
+    if _shared_storage is not None:
+        await _shared_storage.shutdown()
@@ -86,28 +86,36 @@ dirs_to_delete = [
     "__pycache__"
 ]
 
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+# ディレクトリを1回だけ走査し、削除対象のうち存在するものを求める
+with os.scandir(base_dir) as entries:
+    present_names = {entry.name for entry in entries}
+
 # ファイルを削除
 for file in files_to_delete:
-    file_path = os.path.join(os.path.dirname(__file__), file)
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            print(f"✅ 削除成功: {file}")
-        except Exception as e:
-            print(f"❌ 削除失敗: {file} - {e}")
-    else:
+    if file not in present_names:
         print(f"⚠️ ファイルが見つかりません: {file}")
+        continue
+    try:
+        os.unlink(os.path.join(base_dir, file))
+        print(f"✅ 削除成功: {file}")
+    except FileNotFoundError:
+        print(f"⚠️ ファイルが見つかりません: {file}")
+    except Exception as e:
+        print(f"❌ 削除失敗: {file} - {e}")
 
 # ディレクトリを削除
 for dir in dirs_to_delete:
-    dir_path = os.path.join(os.path.dirname(__file__), dir)
-    if os.path.exists(dir_path):
-        try:
-            shutil.rmtree(dir_path)
-            print(f"✅ ディレクトリ削除成功: {dir}")
-        except Exception as e:
-            print(f"❌ ディレクトリ削除失敗: {dir} - {e}")
-    else:
+    if dir not in present_names:
+        print(f"⚠️ ディレクトリが見つかりません: {dir}")
+        continue
+    try:
+        shutil.rmtree(os.path.join(base_dir, dir))
+        print(f"✅ ディレクトリ削除成功: {dir}")
+    except FileNotFoundError:
         print(f"⚠️ ディレクトリが見つかりません: {dir}")
+    except Exception as e:
+        print(f"❌ ディレクトリ削除失敗: {dir} - {e}")
 
 print("\n🎉 クリーンアップ完了！")
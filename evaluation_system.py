@@ -5,14 +5,128 @@
 
 import logging
 import json
-import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from vertexai.generative_models import GenerativeModel
+import asyncio
+import string
+import weakref
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, NamedTuple
+from dataclasses import dataclass, fields
+import numpy as np
+from cachetools import TTLCache
+import orjson
+from vertexai.generative_models import GenerativeModel, GenerationConfig
+from vertexai.language_models import TextEmbeddingModel
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# バッチ評価の設定（1回のLLM呼び出しで評価する人数と、同時に実行するLLM呼び出し数）
+EVALUATION_BATCH_SIZE = 5
+EVALUATION_CONCURRENCY = 8
+
+# 単独要約のキャッシュ設定（(researchmap_url, query) ごとにLLMの応答を保持）
+SUMMARY_CACHE_MAXSIZE = 4096
+SUMMARY_CACHE_TTL_SECONDS = 3600
+
+# 類似クエリの要約を再利用するセマンティックキャッシュの設定
+SEMANTIC_SUMMARY_SIMILARITY_THRESHOLD = 0.92
+SEMANTIC_SUMMARY_MAX_ENTRIES_PER_URL = 32
+SUMMARY_EMBEDDING_MODEL_NAME = "text-multilingual-embedding-002"
+
+@lru_cache(maxsize=256)
+def _query_tokens(query: str) -> Tuple[str, ...]:
+    """クエリを小文字化して空白で分割（同一クエリの研究者ごとの再分割を避ける）"""
+    return tuple(query.lower().split())
+
+# バッチ評価プロンプトのテンプレート（呼び出しごとのf-string組み立てを避けるため事前に生成）
+_RESEARCHER_INFO_TEMPLATE = string.Template("""
+研究者${index}:
+名前: ${name_ja}
+所属: ${main_affiliation_name_ja}
+研究キーワード: ${research_keywords_ja}
+研究分野: ${research_fields_ja}
+プロフィール: ${profile_ja}
+主要論文: ${paper_title_ja_first}
+主要プロジェクト: ${project_title_ja_first}
+""")
+
+_BATCH_EVALUATION_PROMPT_TEMPLATE = string.Template("""以下の研究者と検索クエリ「${query}」の関連性を評価してください。
+
+${researchers_info}
+
+各研究者について、以下の7つの観点で1-10点で評価し、各スコアの理由を含めてJSON形式で出力してください：
+
+1. keyword_match: クエリと研究キーワードの一致度
+2. research_directness: 研究内容とクエリの直接的関連性
+3. expertise_depth: 該当分野での専門性の深さ
+4. practical_evidence: 具体的な実績・エビデンス
+5. research_quality: 研究の質と影響力
+6. interdisciplinary: 学際性・応用可能性
+7. recency: 研究の最新性
+
+出力形式:
+{
+  "evaluations": [
+    {
+      "researcher_index": 1,
+      "scores": {
+        "keyword_match": 8,
+        "research_directness": 9,
+        "expertise_depth": 7,
+        "practical_evidence": 8,
+        "research_quality": 7,
+        "interdisciplinary": 6,
+        "recency": 8
+      },
+      "score_reasons": {
+        "keyword_match": "研究キーワードに『${query}』が直接含まれている",
+        "research_directness": "主要プロジェクトが${query}の実用化に焦点",
+        "expertise_depth": "該当分野で10年以上の研究実績",
+        "practical_evidence": "関連特許3件、実用化事例あり",
+        "research_quality": "トップジャーナルへの掲載実績",
+        "interdisciplinary": "工学と医学の融合研究を推進",
+        "recency": "2024年に最新の研究成果を発表"
+      },
+      "summary": "研究キーワード、プロフィール、主要論文、主要プロジェクトを踏まえて、検索クエリとの関連性を200字程度で要約",
+      "strengths": ["強み1", "強み2", "強み3"]
+    }
+  ]
+}
+""")
+
+class _ResearcherView(NamedTuple):
+    """評価で繰り返し参照する研究者フィールドの前処理済みビュー（バッチごとに1回だけ作成）"""
+    keywords_lower: str
+    fields_lower: str
+    profile_excerpt: str
+
+def _build_researcher_view(researcher: Dict[str, Any]) -> _ResearcherView:
+    """小文字化したキーワード・研究分野と、300字に切り詰めたプロフィールを作成"""
+    return _ResearcherView(
+        keywords_lower=(researcher.get('research_keywords_ja', '') or '').lower(),
+        fields_lower=(researcher.get('research_fields_ja', '') or '').lower(),
+        profile_excerpt=str(researcher['profile_ja'])[:300] if researcher.get('profile_ja') else ''
+    )
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json_object(text: str) -> Optional[Any]:
+    """
+    LLM出力からJSONを取り出す
+    純粋なJSONならorjsonで一括パースし、前後に文章やコードフェンスがある場合は
+    最初の '{' から1オブジェクト分だけを読み取る
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    
+    json_start = text.find('{')
+    if json_start < 0:
+        return None
+    parsed, _ = _JSON_DECODER.raw_decode(text, json_start)
+    return parsed
+
+@dataclass(slots=True)
 class EvaluationCriteria:
     """評価基準の定義"""
     keyword_match: float = 0.25
@@ -23,7 +137,7 @@ class EvaluationCriteria:
     interdisciplinary: float = 0.10
     recency: float = 0.05
 
-@dataclass
+@dataclass(slots=True)
 class ResearcherEvaluation:
     """研究者の評価結果"""
     researcher_data: Dict[str, Any]
@@ -33,30 +147,86 @@ class ResearcherEvaluation:
     strengths: List[str]
     score_reasons: Optional[Dict[str, str]] = None
     
+class SemanticSummaryCache:
+    """
+    researchmap_url ごとに (正規化済みクエリベクトル, クエリ, 要約) を保持し、
+    コサイン類似度が閾値以上の過去クエリがあればその要約を返すキャッシュ
+    """
+    
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_SUMMARY_SIMILARITY_THRESHOLD,
+        maxsize: int = SUMMARY_CACHE_MAXSIZE,
+        ttl: float = SUMMARY_CACHE_TTL_SECONDS,
+        max_entries_per_url: int = SEMANTIC_SUMMARY_MAX_ENTRIES_PER_URL
+    ):
+        self.threshold = threshold
+        self.max_entries_per_url = max_entries_per_url
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    def has_entries(self, researchmap_url: str) -> bool:
+        """この研究者の要約が1件以上登録されているか"""
+        return bool(self._entries.get(researchmap_url))
+    
+    def lookup(self, researchmap_url: str, vector: np.ndarray) -> Optional[Tuple[str, str, float]]:
+        """類似クエリの要約を検索し、(クエリ, 要約, 類似度) を返す"""
+        entries = self._entries.get(researchmap_url)
+        if not entries:
+            return None
+        similarities = np.vstack([entry[0] for entry in entries]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        _, cached_query, summary = entries[best]
+        return cached_query, summary, float(similarities[best])
+    
+    def add(self, researchmap_url: str, vector: np.ndarray, query: str, summary: str) -> None:
+        """要約を登録（URLごとの上限を超えた分は古いものから破棄）"""
+        entries = list(self._entries.get(researchmap_url, ()))
+        entries.append((vector, query, summary))
+        self._entries[researchmap_url] = entries[-self.max_entries_per_url:]
+
 class UniversalResearchEvaluator:
     """汎用的な研究者評価システム"""
     
     def __init__(self):
         self.criteria = EvaluationCriteria()
+        # 総合スコア計算用の (評価軸, 重み) と重みの合計を事前計算
+        self._criteria_weights = tuple(
+            (field.name, getattr(self.criteria, field.name)) for field in fields(self.criteria)
+        )
+        self._total_weight = sum(weight for _, weight in self._criteria_weights)
+        self._summary_cache = TTLCache(maxsize=SUMMARY_CACHE_MAXSIZE, ttl=SUMMARY_CACHE_TTL_SECONDS)
+        # 同一キーの同時リクエストを1回のLLM呼び出しにまとめるためのロック
+        self._summary_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._semantic_summary_cache = SemanticSummaryCache()
+        self._embedding_model = None
         self.model = None
         self._initialize_llm()
     
     def _initialize_llm(self):
         """LLMモデルの初期化"""
+        # 生成設定は呼び出しごとに作らず使い回す
+        self._batch_generation_config = GenerationConfig(
+            temperature=0.1,
+            max_output_tokens=2048,
+            top_p=0.8
+        )
+        self._summary_generation_config = GenerationConfig(temperature=0.2)
         try:
             # Gemini 2.5 Flash Liteを優先（2.0系は2026-03-06以降新規利用不可）
             self.model = GenerativeModel("gemini-2.5-flash-lite")
             self.model_name = "gemini-2.5-flash-lite"
-            logger.info(f"✅ 評価用LLMモデル初期化: {self.model_name}")
+            logger.info("✅ 評価用LLMモデル初期化: %s", self.model_name)
         except Exception as e:
-            logger.warning(f"⚠️ Gemini 2.5 Flash Lite初期化失敗: {e}")
+            logger.warning("⚠️ Gemini 2.5 Flash Lite初期化失敗: %s", e)
             try:
                 # フォールバック
                 self.model = GenerativeModel("gemini-2.5-flash")
                 self.model_name = "gemini-2.5-flash"
-                logger.info(f"✅ フォールバックLLMモデル初期化: {self.model_name}")
+                logger.info("✅ フォールバックLLMモデル初期化: %s", self.model_name)
             except Exception as e2:
-                logger.error(f"❌ LLMモデル初期化失敗: {e2}")
+                logger.error("❌ LLMモデル初期化失敗: %s", e2)
                 self.model = None
     
     async def evaluate_researchers(
@@ -80,152 +250,121 @@ class UniversalResearchEvaluator:
             # 従来の評価方式（互換性のため）
             return self._legacy_evaluate(researchers, query)
         
-        logger.info(f"🎯 内部評価モード開始: {len(researchers)}名の研究者を評価")
+        logger.info("🎯 内部評価モード開始: %s名の研究者を評価", len(researchers))
         
-        evaluations = []
-        
-        # バッチ処理で効率化（5人ずつ）
-        batch_size = 5
-        for i in range(0, len(researchers), batch_size):
-            batch = researchers[i:i+batch_size]
-            batch_evaluations = await self._evaluate_batch(batch, query)
-            evaluations.extend(batch_evaluations)
+        if not self.model:
+            # LLMが使えない場合はバッチに分けずに全員を簡易評価
+            evaluations = [self._simple_evaluate(r, query) for r in researchers]
+        else:
+            # バッチ処理で効率化（5人ずつ、同時実行数はセマフォで制限してレート制限対策）
+            semaphore = asyncio.Semaphore(EVALUATION_CONCURRENCY)
             
-            # レート制限対策
-            if i + batch_size < len(researchers):
-                time.sleep(0.5)
+            async def evaluate_with_limit(batch: List[Dict[str, Any]]) -> List[ResearcherEvaluation]:
+                async with semaphore:
+                    return await self._evaluate_batch(batch, query)
+            
+            batch_results = await asyncio.gather(*[
+                evaluate_with_limit(researchers[i:i + EVALUATION_BATCH_SIZE])
+                for i in range(0, len(researchers), EVALUATION_BATCH_SIZE)
+            ])
+            evaluations = [evaluation for batch_evaluations in batch_results for evaluation in batch_evaluations]
         
-        # スコアでソート
-        evaluations.sort(key=lambda x: x.total_score, reverse=True)
+        # スコアでソート（同点は元の順序を維持）
+        evaluations = self._sort_by_total_score(evaluations)
         
-        logger.info(f"✅ 評価完了: 最高スコア {evaluations[0].total_score:.1f}/10")
+        if evaluations:
+            logger.info("✅ 評価完了: 最高スコア %.1f/10", evaluations[0].total_score)
         
         return evaluations
     
+    @staticmethod
+    def _sort_by_total_score(evaluations: List[ResearcherEvaluation]) -> List[ResearcherEvaluation]:
+        """総合スコアの降順に並べ替え（NumPyの安定ソートで順位を一括計算）"""
+        totals = np.fromiter((e.total_score for e in evaluations), dtype=np.float64, count=len(evaluations))
+        order = np.argsort(-totals, kind="stable")
+        return [evaluations[i] for i in order]
+    
     async def _evaluate_batch(
         self, 
         researchers: List[Dict[str, Any]], 
         query: str
     ) -> List[ResearcherEvaluation]:
         """研究者のバッチを評価"""
+        views = [_build_researcher_view(r) for r in researchers]
+        
         if not self.model:
             # LLMが使えない場合は簡易評価
-            return [self._simple_evaluate(r, query) for r in researchers]
+            return [self._simple_evaluate(r, query, view) for r, view in zip(researchers, views)]
         
-        prompt = self._create_batch_evaluation_prompt(researchers, query)
+        prompt = self._create_batch_evaluation_prompt(researchers, query, views)
         
         try:
-            response = self.model.generate_content(
+            # 同期APIのためスレッドで実行し、他のバッチと並行して待機できるようにする
+            response = await asyncio.to_thread(
+                self.model.generate_content,
                 prompt,
-                generation_config={
-                    "temperature": 0.1,
-                    "max_output_tokens": 2048,
-                    "top_p": 0.8
-                }
+                generation_config=self._batch_generation_config
             )
             evaluation_text = response.text
             
             # JSON形式の評価結果をパース
-            evaluations = self._parse_evaluation_response(evaluation_text, researchers, query)
+            evaluations = self._parse_evaluation_response(evaluation_text, researchers, query, views)
             return evaluations
             
         except Exception as e:
-            logger.error(f"❌ バッチ評価エラー: {e}")
+            logger.error("❌ バッチ評価エラー: %s", e)
             # エラー時は簡易評価にフォールバック
-            return [self._simple_evaluate(r, query) for r in researchers]
+            return [self._simple_evaluate(r, query, view) for r, view in zip(researchers, views)]
     
     def _create_batch_evaluation_prompt(
         self, 
         researchers: List[Dict[str, Any]], 
-        query: str
+        query: str,
+        views: Optional[List[_ResearcherView]] = None
     ) -> str:
         """バッチ評価用のプロンプトを生成"""
-        researchers_info = []
-        for idx, r in enumerate(researchers):
-            info = f"""
-研究者{idx + 1}:
-名前: {r.get('name_ja', '')}
-所属: {r.get('main_affiliation_name_ja', '')}
-研究キーワード: {r.get('research_keywords_ja', '')}
-研究分野: {r.get('research_fields_ja', '')}
-プロフィール: {str(r.get('profile_ja', ''))[:300] if r.get('profile_ja') else ''}
-主要論文: {r.get('paper_title_ja_first', '')}
-主要プロジェクト: {r.get('project_title_ja_first', '')}
-"""
-            researchers_info.append(info)
-        
-        prompt = f"""以下の研究者と検索クエリ「{query}」の関連性を評価してください。
-
-{chr(10).join(researchers_info)}
-
-各研究者について、以下の7つの観点で1-10点で評価し、各スコアの理由を含めてJSON形式で出力してください：
-
-1. keyword_match: クエリと研究キーワードの一致度
-2. research_directness: 研究内容とクエリの直接的関連性
-3. expertise_depth: 該当分野での専門性の深さ
-4. practical_evidence: 具体的な実績・エビデンス
-5. research_quality: 研究の質と影響力
-6. interdisciplinary: 学際性・応用可能性
-7. recency: 研究の最新性
-
-出力形式:
-{{
-  "evaluations": [
-    {{
-      "researcher_index": 1,
-      "scores": {{
-        "keyword_match": 8,
-        "research_directness": 9,
-        "expertise_depth": 7,
-        "practical_evidence": 8,
-        "research_quality": 7,
-        "interdisciplinary": 6,
-        "recency": 8
-      }},
-      "score_reasons": {{
-        "keyword_match": "研究キーワードに『{query}』が直接含まれている",
-        "research_directness": "主要プロジェクトが{query}の実用化に焦点",
-        "expertise_depth": "該当分野で10年以上の研究実績",
-        "practical_evidence": "関連特許3件、実用化事例あり",
-        "research_quality": "トップジャーナルへの掲載実績",
-        "interdisciplinary": "工学と医学の融合研究を推進",
-        "recency": "2024年に最新の研究成果を発表"
-      }},
-      "summary": "研究キーワード、プロフィール、主要論文、主要プロジェクトを踏まえて、検索クエリとの関連性を200字程度で要約",
-      "strengths": ["強み1", "強み2", "強み3"]
-    }}
-  ]
-}}
-"""
-        return prompt
+        if views is None:
+            views = [_build_researcher_view(r) for r in researchers]
+        researchers_info = "\n".join(
+            _RESEARCHER_INFO_TEMPLATE.substitute(
+                index=idx + 1,
+                name_ja=r.get('name_ja', ''),
+                main_affiliation_name_ja=r.get('main_affiliation_name_ja', ''),
+                research_keywords_ja=r.get('research_keywords_ja', ''),
+                research_fields_ja=r.get('research_fields_ja', ''),
+                profile_ja=view.profile_excerpt,
+                paper_title_ja_first=r.get('paper_title_ja_first', ''),
+                project_title_ja_first=r.get('project_title_ja_first', '')
+            )
+            for idx, (r, view) in enumerate(zip(researchers, views))
+        )
+        return _BATCH_EVALUATION_PROMPT_TEMPLATE.substitute(query=query, researchers_info=researchers_info)
     
     def _parse_evaluation_response(
         self, 
         response_text: str, 
         researchers: List[Dict[str, Any]], 
-        query: str
+        query: str,
+        views: Optional[List[_ResearcherView]] = None
     ) -> List[ResearcherEvaluation]:
         """LLMの評価レスポンスをパース"""
-        evaluations = []
+        # researcher_index（0始まり）→ 評価結果
+        evaluations_by_index: Dict[int, ResearcherEvaluation] = {}
         
         try:
             # JSONレスポンスを抽出
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                json_text = response_text[json_start:json_end]
-                parsed = json.loads(json_text)
-                
+            parsed = _extract_json_object(response_text)
+            if parsed is not None:
                 for eval_data in parsed.get('evaluations', []):
                     idx = eval_data.get('researcher_index', 1) - 1
-                    if 0 <= idx < len(researchers):
+                    if 0 <= idx < len(researchers) and idx not in evaluations_by_index:
                         researcher = researchers[idx]
                         scores = eval_data.get('scores', {})
                         
                         # 総合スコアを計算
                         total_score = self._calculate_total_score(scores)
                         
-                        evaluation = ResearcherEvaluation(
+                        evaluations_by_index[idx] = ResearcherEvaluation(
                             researcher_data=researcher,
                             scores=scores,
                             total_score=total_score,
@@ -233,58 +372,40 @@ class UniversalResearchEvaluator:
                             strengths=eval_data.get('strengths', []),
                             score_reasons=eval_data.get('score_reasons', {})
                         )
-                        evaluations.append(evaluation)
             
         except Exception as e:
-            logger.error(f"❌ 評価レスポンスのパースエラー: {e}")
-        
-        # パースできなかった研究者は簡易評価
-        if len(evaluations) < len(researchers):
-            for i, researcher in enumerate(researchers):
-                if not any(e.researcher_data == researcher for e in evaluations):
-                    evaluations.append(self._simple_evaluate(researcher, query))
+            logger.error("❌ 評価レスポンスのパースエラー: %s", e)
         
-        return evaluations
+        # 入力順に並べ、パースできなかった研究者は簡易評価
+        return [
+            evaluations_by_index[i] if i in evaluations_by_index
+            else self._simple_evaluate(researcher, query, views[i] if views else None)
+            for i, researcher in enumerate(researchers)
+        ]
     
     def _calculate_total_score(self, scores: Dict[str, float]) -> float:
         """重み付けされた総合スコアを計算"""
-        weighted_sum = 0
-        total_weight = 0
-        
-        criteria_weights = {
-            'keyword_match': self.criteria.keyword_match,
-            'research_directness': self.criteria.research_directness,
-            'expertise_depth': self.criteria.expertise_depth,
-            'practical_evidence': self.criteria.practical_evidence,
-            'research_quality': self.criteria.research_quality,
-            'interdisciplinary': self.criteria.interdisciplinary,
-            'recency': self.criteria.recency
-        }
-        
-        for criterion, weight in criteria_weights.items():
-            score = scores.get(criterion, 5)  # デフォルト5点
-            weighted_sum += score * weight
-            total_weight += weight
-        
-        if total_weight > 0:
-            return round(weighted_sum / total_weight, 1)
+        if self._total_weight > 0:
+            weighted_sum = sum(scores.get(criterion, 5) * weight for criterion, weight in self._criteria_weights)  # デフォルト5点
+            return round(weighted_sum / self._total_weight, 1)
         return 5.0
     
     def _simple_evaluate(
         self, 
         researcher: Dict[str, Any], 
-        query: str
+        query: str,
+        view: Optional[_ResearcherView] = None
     ) -> ResearcherEvaluation:
         """LLMを使わない簡易評価"""
-        query_lower = query.lower()
-        keywords = (researcher.get('research_keywords_ja', '') or '').lower()
-        fields = (researcher.get('research_fields_ja', '') or '').lower()
-        profile = (researcher.get('profile_ja', '') or '').lower()
+        if view is None:
+            view = _build_researcher_view(researcher)
         
-        # キーワードマッチング
-        keyword_match = sum(1 for word in query_lower.split() if word in keywords)
-        field_match = sum(1 for word in query_lower.split() if word in fields)
-        profile_match = sum(1 for word in query_lower.split() if word in profile)
+        # キーワードマッチング（日本語は空白で分かち書きされないため部分一致で判定）
+        keyword_match = 0
+        field_match = 0
+        for word in _query_tokens(query):
+            keyword_match += word in view.keywords_lower
+            field_match += word in view.fields_lower
         
         # 簡易スコア計算
         scores = {
@@ -307,28 +428,102 @@ class UniversalResearchEvaluator:
             strengths=[]
         )
         
-    async def generate_single_summary(self, researcher_data: Dict[str, Any], query: str) -> Optional[str]:
+    async def generate_single_summary(
+        self,
+        researcher_data: Dict[str, Any],
+        query: str,
+        researchmap_url: Optional[str] = None
+    ) -> Optional[str]:
         """
         単一の研究者データと検索クエリから関連性要約を生成する
+        (researchmap_url, query) が同じ要約はTTL付きでキャッシュし、LLMを再度呼び出さない
         """
         # 最初にLLMが利用可能かチェック
         if not self.model:
             logger.warning("LLM not available for single summary generation.")
             return "LLMが利用できないため、要約を生成できませんでした。"
 
+        researchmap_url = researchmap_url or researcher_data.get('researchmap_url')
+        if not researchmap_url:
+            return await self._generate_single_summary_uncached(researcher_data, query)
+
+        cache_key = (researchmap_url, query)
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            logger.info("単独要約をキャッシュから返却: %s (Query: %s)", researchmap_url, query)
+            return cached
+
+        lock = self._summary_locks.get(cache_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._summary_locks[cache_key] = lock
+
+        async with lock:
+            # 待機中に他のリクエストが生成済みであればそれを使う
+            cached = self._summary_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            if self._semantic_summary_cache.has_entries(researchmap_url):
+                # 完全一致がなければ、同じ研究者に対する類似クエリの要約を探す
+                query_vector = await self._embed_query(query)
+                if query_vector is not None:
+                    hit = self._semantic_summary_cache.lookup(researchmap_url, query_vector)
+                    if hit is not None:
+                        cached_query, summary, similarity = hit
+                        logger.info("単独要約を類似クエリのキャッシュから返却: %s (Query: %s ≈ %s, 類似度: %.3f)", researchmap_url, query, cached_query, similarity)
+                        self._summary_cache[cache_key] = summary
+                        return summary
+                summary = await self._generate_single_summary_uncached(researcher_data, query)
+            else:
+                # この研究者の要約が未登録なら類似検索は当たらないため、ベクトル化は登録用として要約生成と並行して行う
+                query_vector, summary = await asyncio.gather(
+                    self._embed_query(query),
+                    self._generate_single_summary_uncached(researcher_data, query)
+                )
+            if summary:
+                self._summary_cache[cache_key] = summary
+                if query_vector is not None:
+                    self._semantic_summary_cache.add(researchmap_url, query_vector, query, summary)
+            return summary
+
+    async def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """クエリをベクトル化してL2正規化する（失敗時はNoneを返し、セマンティックキャッシュを使わない）"""
+        try:
+            if self._embedding_model is None:
+                self._embedding_model = await asyncio.to_thread(
+                    TextEmbeddingModel.from_pretrained, SUMMARY_EMBEDDING_MODEL_NAME
+                )
+            embeddings = await asyncio.to_thread(self._embedding_model.get_embeddings, [query])
+            vector = np.asarray(embeddings[0].values, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return None
+            return vector / norm
+        except Exception as e:
+            logger.warning("⚠️ クエリのベクトル化に失敗（セマンティックキャッシュを使用しません）: %s", e)
+            return None
+
+    async def _generate_single_summary_uncached(self, researcher_data: Dict[str, Any], query: str) -> Optional[str]:
+        """LLMを呼び出して単独要約を生成"""
         # プロンプトを作成し、LLMを呼び出す
         try:
             prompt = self._create_single_summary_prompt(researcher_data, query)
             
-            logger.info(f"単独要約生成のためLLMを呼び出し: {researcher_data.get('name_ja')} (Query: {query})")
+            logger.info("単独要約生成のためLLMを呼び出し: %s (Query: %s)", researcher_data.get('name_ja'), query)
             
-            response = self.model.generate_content(prompt, generation_config={"temperature": 0.2})
+            # 同期APIのためスレッドで実行し、待機中も他のリクエストを処理できるようにする
+            response = await asyncio.to_thread(
+                self.model.generate_content,
+                prompt,
+                generation_config=self._summary_generation_config
+            )
             summary = response.text
             
             return summary.strip()
 
         except Exception as e:
-            logger.error(f"❌ 単独要約の生成エラー: {e}")
+            logger.error("❌ 単独要約の生成エラー: %s", e)
             return None
 
     def _create_single_summary_prompt(self, researcher: Dict[str, Any], query: str) -> str:
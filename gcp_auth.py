@@ -7,13 +7,32 @@ import os
 import json
 import base64
 import logging
+import time
 from google.cloud import bigquery
-from google.cloud import aiplatform
 import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
+
+try:
+    from google.cloud import bigquery_storage_v1
+    BQ_STORAGE_AVAILABLE = True
+except ImportError:
+    BQ_STORAGE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# BigQuery HTTP接続プールの設定
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+HTTP_MAX_RETRIES = 3
+
+# 件数確認結果のキャッシュ有効期間（秒）
+ROW_COUNT_CACHE_TTL_SECONDS = 300
+
+# 初期化失敗後、再試行を控える間隔（秒）
+INIT_RETRY_INTERVAL_SECONDS = 10
+
 class GCPClientManager:
     """GCP クライアント管理クラス"""
     
@@ -25,11 +44,22 @@ class GCPClientManager:
         # クライアント
         self.credentials = None
         self.bq_client = None
+        self.bqstorage_client = None
         self.ai_platform_initialized = False
         self.initialized = False
         
+        # 件数確認結果のキャッシュ (取得時刻, 件数)
+        self._count_cache = (0.0, None)
+        
+        # 直近の初期化失敗時刻（連続した再試行を抑止するため）
+        self._last_init_failure_at = None
+        
     def _get_credentials(self):
         """認証情報を取得（個別環境変数対応）"""
+        # 秘密鍵の解析は重いため、一度構築した認証情報を再利用する
+        if self.credentials is not None:
+            return self.credentials
+        
         try:
             # 方法1: 個別の環境変数からサービスアカウント情報を構築
             service_account_email = os.getenv("GCP_SERVICE_ACCOUNT_EMAIL")
@@ -85,13 +115,17 @@ class GCPClientManager:
             return credentials
             
         except Exception as e:
-            logger.error(f"❌ 認証情報の取得に失敗: {e}")
+            logger.error("❌ 認証情報の取得に失敗: %s", e)
             return None
     
     def initialize_clients(self):
         """GCPクライアントを初期化"""
         if self.initialized:
             return True
+        
+        # 失敗直後はリクエストごとに認証・接続確認をやり直さず、前回の結果を返す
+        if self._last_init_failure_at is not None and time.monotonic() - self._last_init_failure_at < INIT_RETRY_INTERVAL_SECONDS:
+            return False
             
         try:
             logger.info("🔧 GCPクライアント初期化開始...")
@@ -103,21 +137,37 @@ class GCPClientManager:
             
             # BigQueryクライアント
             logger.info("📊 BigQueryクライアント初期化...")
+            # TLS接続をクエリ間で再利用するため、接続プールを持つセッションを明示的に渡す
+            session = AuthorizedSession(self.credentials)
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=HTTP_MAX_RETRIES
+            )
+            session.mount("https://", adapter)
             self.bq_client = bigquery.Client(
                 project=self.project_id,
-                credentials=self.credentials
+                credentials=self.credentials,
+                _http=session
             )
             
+            # BigQuery Storage Read API クライアント（大きな結果セットをArrowで取得するため）
+            if BQ_STORAGE_AVAILABLE:
+                try:
+                    self.bqstorage_client = bigquery_storage_v1.BigQueryReadClient(credentials=self.credentials)
+                except Exception as e:
+                    logger.warning("⚠️ BigQuery Storage Read APIクライアント初期化失敗 - REST取得を使用: %s", e)
+                    self.bqstorage_client = None
+            
             # 接続テスト
-            test_query = f"SELECT COUNT(*) as total FROM `{self.table_id}` LIMIT 1"
-            query_job = self.bq_client.query(test_query)
-            results = list(query_job.result())
-            total_count = results[0].total if results else 0
+            total_count = self.get_table_row_count()
             
-            logger.info(f"✅ BigQuery接続確認: {total_count}件のデータを検出")
+            logger.info("✅ BigQuery接続確認: %s件のデータを検出", total_count)
             
             # Vertex AI初期化
             logger.info("🤖 Vertex AI初期化...")
+            # aiplatformは読み込みが重いため、初期化が必要になった時点で読み込む
+            from google.cloud import aiplatform
             aiplatform.init(
                 project=self.project_id,
                 location=self.location,
@@ -127,14 +177,29 @@ class GCPClientManager:
             logger.info("✅ Vertex AI初期化完了")
             
             self.initialized = True
+            self._last_init_failure_at = None
             logger.info("🎉 すべてのGCPクライアント初期化完了")
             return True
             
         except Exception as e:
-            logger.error(f"❌ GCPクライアント初期化失敗: {e}")
+            logger.error("❌ GCPクライアント初期化失敗: %s", e)
             self.initialized = False
+            self._last_init_failure_at = time.monotonic()
             return False
     
+    def get_table_row_count(self):
+        """テーブルの件数を取得（TTL付きでキャッシュ）"""
+        cached_at, cached_count = self._count_cache
+        if cached_count is not None and time.time() - cached_at < ROW_COUNT_CACHE_TTL_SECONDS:
+            return cached_count
+        
+        # クエリジョブではなくテーブルのメタデータから件数を取得する（スキャン課金なし）
+        table = self.bq_client.get_table(self.table_id)
+        total_count = table.num_rows or 0
+        
+        self._count_cache = (time.time(), total_count)
+        return total_count
+    
     def get_bigquery_client(self):
         """BigQueryクライアントを取得"""
         if not self.initialized:
@@ -178,6 +243,10 @@ def get_bigquery_client():
     """BigQueryクライアントを取得（初期化も実行）"""
     return gcp_manager.get_bigquery_client()
 
+def get_bqstorage_client():
+    """BigQuery Storage Read APIクライアントを取得（未初期化・利用不可の場合はNone）"""
+    return gcp_manager.bqstorage_client
+
 def is_vertex_ai_ready():
     """Vertex AIが利用可能かチェック"""
     return gcp_manager.is_vertex_ai_ready()
@@ -2,19 +2,44 @@
 研究者検索API - v2.1.1 (最終修正版)
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from pydantic import BaseModel, Field
-import pandas as pd
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from pydantic import BaseModel, ConfigDict, Field
 import os
+import re
+import secrets
+import sys
 import time
 import asyncio
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+from typing import List, Literal, Optional, Dict, Any, Tuple
 import logging
+import orjson
+from cachetools import LRUCache, TTLCache
 
 from dotenv import load_dotenv
 
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    from google.api_core.exceptions import GoogleAPIError
+    GOOGLE_API_CORE_AVAILABLE = True
+except ImportError:
+    GOOGLE_API_CORE_AVAILABLE = False
+
 # .envファイルを読み込む
 load_dotenv()
 
@@ -24,32 +49,86 @@ from project_manager import (
     ProjectCreateRequest,
     ResearcherSelectionRequest,
     MatchingRequest,
+    ProjectStatusUpdate,
+    ResearcherMemoBody,
     TempProject
 )
 
-# ロギング設定
-logging.basicConfig(level=logging.INFO)
+# GCP認証ヘルパーはモジュール読み込み時に一度だけ解決する
+try:
+    from gcp_auth import get_bigquery_client, get_bqstorage_client, get_gcp_status, initialize_gcp_on_startup
+    GCP_AUTH_AVAILABLE = True
+    GCP_AUTH_IMPORT_ERROR = None
+except ImportError as e:
+    GCP_AUTH_AVAILABLE = False
+    GCP_AUTH_IMPORT_ERROR = str(e)
+
+# 実際の検索機能はVertex AI初期化後に startup_event で一度だけ読み込む
+perform_real_search = None
+search_evaluator = None
+
+# ロギング設定（本番ではLOG_LEVEL=WARNINGでINFOログの整形処理ごと省略できる）
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # FastAPI アプリケーション作成
+# 本番では ENABLE_API_DOCS=false で /docs・/redoc・/openapi.json を無効化し、スキーマ生成も行わない
+ENABLE_API_DOCS = os.getenv("ENABLE_API_DOCS", "true").lower() == "true"
+
 app = FastAPI(
     title="研究者検索API",
     description="AI研究者検索システムのAPIエンドポイント",
-    version="2.1.1"
+    version="2.1.1",
+    docs_url="/docs" if ENABLE_API_DOCS else None,
+    redoc_url="/redoc" if ENABLE_API_DOCS else None,
+    openapi_url="/openapi.json" if ENABLE_API_DOCS else None,
+    # レスポンスのシリアライズはorjsonで行う
+    default_response_class=ORJSONResponse
 )
 # 余計なリダイレクトを防ぐ
 app.router.redirect_slashes = False
 
 # 本番/プレビューの Vercel を許可
 ALLOWED_ORIGIN_REGEX = r"^https:\/\/research-partner-dashboard(?:-[a-z0-9-]+)?\.vercel\.app$"
+_ALLOWED_ORIGIN_RE = re.compile(ALLOWED_ORIGIN_REGEX)
+_ALLOWED_ORIGIN_PREFIX = "https://research-partner-dashboard"
+_ALLOWED_ORIGIN_SUFFIX = ".vercel.app"
+# 本番Originは完全一致の集合で判定する
+_ALLOWED_ORIGINS = frozenset({"https://research-partner-dashboard.vercel.app"})
+
+def is_allowed_origin(origin: str) -> bool:
+    """許可するOriginか判定（本番は集合で即判定し、プレビューは接頭辞・接尾辞で絞ってから正規表現で厳密に確認）"""
+    if origin in _ALLOWED_ORIGINS:
+        return True
+    return (
+        origin.startswith(_ALLOWED_ORIGIN_PREFIX)
+        and origin.endswith(_ALLOWED_ORIGIN_SUFFIX)
+        and _ALLOWED_ORIGIN_RE.fullmatch(origin) is not None
+    )
+
+class AllowedOriginCORSMiddleware(CORSMiddleware):
+    """Origin判定を is_allowed_origin に置き換えたCORSミドルウェア"""
+    def is_allowed_origin(self, origin: str) -> bool:
+        return is_allowed_origin(origin)
+
+# 大学一覧や検索結果の日本語JSONは圧縮効果が大きいため、一定サイズ以上の応答をgzip圧縮する
+# brotli-asgi が導入されていれば、対応クライアントにはより小さいBrotliで返す（非対応クライアントにはgzip）
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+BROTLI_QUALITY = 4
+
+if BROTLI_AVAILABLE:
+    app.add_middleware(BrotliMiddleware, quality=BROTLI_QUALITY, minimum_size=GZIP_MINIMUM_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
 # CORS設定
 app.add_middleware(
-    CORSMiddleware,
+    AllowedOriginCORSMiddleware,
     # allow_origins=["*"],
     allow_origin_regex=ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
     allow_headers=["*"],
     expose_headers=["*"],
 )
@@ -58,17 +137,26 @@ app.add_middleware(
 PROJECT_ID = os.getenv("PROJECT_ID", "apt-rope-217206")
 LOCATION = os.getenv("LOCATION", "us-central1")
 BIGQUERY_TABLE = os.getenv("BIGQUERY_TABLE", "apt-rope-217206.researcher_data.rd_250524")
+# 大学リストの集計結果を書き出した要約テーブル（設定時は全件集計の代わりにこのテーブルを読む）
+UNIVERSITIES_SUMMARY_TABLE = os.getenv("UNIVERSITIES_SUMMARY_TABLE")
+# 大学リストのキャッシュ破棄・再集計に必要な管理者トークン（未設定の場合はどちらも無効）
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
 
 # グローバル変数でクライアントを保持
-clients = {
-    "initialized": False,
-    "bq_client": None,
-    "main_llm_model": None,
-    "summary_llm_model": None,
-    "embedding_model": None
-}
+@dataclass(slots=True)
+class ClientState:
+    """アプリケーション全体で共有するクライアントの状態"""
+    initialized: bool = False
+    bq_client: Any = None
+    main_llm_model: Any = None
+    summary_llm_model: Any = None
+    embedding_model: Any = None
+
+clients = ClientState()
 
 class SearchRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    
     query: str
     method: str = "semantic"
     max_results: int = Field(5, alias='maxResults')
@@ -79,10 +167,10 @@ class SearchRequest(BaseModel):
     young_researcher_filter: bool = Field(False, alias='youngResearcherFilter')
     university_filter: Optional[List[str]] = Field(None, alias='universityFilter')
 
-    class Config:
-        allow_population_by_field_name = True
-
 class ResearcherResult(BaseModel):
+    # セマンティック検索の行には embedding などの余分なカラムが含まれるため、検証時に破棄して保持しない
+    model_config = ConfigDict(extra="ignore")
+    
     name_ja: Optional[str] = None
     name_en: Optional[str] = None
     main_affiliation_name_ja: Optional[str] = None
@@ -129,6 +217,8 @@ class AnalysisResponse(BaseModel):
 
 class ResearcherInfoPayload(BaseModel):
     """フロントエンドから送信される研究者情報を格納するモデル"""
+    model_config = ConfigDict(populate_by_name=True)
+    
     name_ja: Optional[str] = Field(None, alias='name_ja')
     research_fields_ja: Optional[str] = Field(None, alias='research_fields_ja')
     project_title_ja_first: Optional[str] = Field(None, alias='project_title_ja_first')
@@ -137,41 +227,74 @@ class ResearcherInfoPayload(BaseModel):
     profile_ja: Optional[str] = Field(None, alias='profile_ja')
     main_affiliation_name_ja: Optional[str] = Field(None, alias='main_affiliation_name_ja')
 
-    class Config:
-        allow_population_by_field_name = True
-
 class SummaryRequest(BaseModel):
     """AI要約生成リクエストのモデル"""
     researchmap_url: str
     query: str
     researcher_info: Optional[ResearcherInfoPayload] = None
 
+# 1回のまとめて要約リクエストで受け付ける件数の上限（1件ごとにBigQuery・埋め込み・LLMの呼び出しを伴うため）
+BATCH_SUMMARY_MAX_ITEMS = 50
+
+class BatchSummaryRequest(BaseModel):
+    """複数研究者のAI要約をまとめて生成するリクエストのモデル"""
+    items: List[SummaryRequest] = Field(..., max_length=BATCH_SUMMARY_MAX_ITEMS)
+
 # --- ここまでが修正されたPydanticモデル ---
 
+# BigQuery呼び出しなどのブロッキング処理を asyncio.to_thread で逃がすスレッド数
+# （既定の min(32, CPU数+4) では1コアのコンテナで同時5件までしか重ならないため引き上げる）
+BLOCKING_IO_MAX_WORKERS = int(os.getenv("BLOCKING_IO_MAX_WORKERS", "64"))
+
 @app.on_event("startup")
 async def startup_event():
     """アプリケーション開始時にGCPクライアントを初期化"""
+    global perform_real_search, search_evaluator
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_MAX_WORKERS, thread_name_prefix="blocking-io")
+    )
     logger.info("🚀 アプリケーション開始 - GCP初期化を実行")
     try:
-        from gcp_auth import initialize_gcp_on_startup
-        success = initialize_gcp_on_startup()
+        if not GCP_AUTH_AVAILABLE:
+            raise ImportError(GCP_AUTH_IMPORT_ERROR)
+        # 認証情報の読み込み・BigQuery接続確認・Vertex AI初期化はブロッキングのためスレッドで実行
+        success = await asyncio.to_thread(initialize_gcp_on_startup)
         if success:
             logger.info("✅ GCPクライアント初期化成功")
-            clients["initialized"] = True
+            clients.initialized = True
         else:
             logger.warning("⚠️ GCPクライアント初期化失敗 - モックモードで継続")
-            clients["initialized"] = False
+            clients.initialized = False
+    except Exception as e:
+        logger.error("❌ GCP初期化中にエラー: %s", e, exc_info=True)
+        clients.initialized = False
+    
+    # 検索ごとのインポートを避けるため、ここで実際の検索機能を束縛しておく
+    try:
+        from real_search import perform_real_search, evaluator as search_evaluator
+        logger.info("✅ 実際の検索機能を読み込みました")
     except Exception as e:
-        logger.error(f"❌ GCP初期化中にエラー: {e}")
-        clients["initialized"] = False
+        logger.error("❌ 実際の検索機能の読み込みに失敗 - モック検索のみ利用可能: %s", e)
 
-@app.get("/")
-async def root():
-    """ルートエンドポイント"""
+@app.on_event("shutdown")
+async def shutdown_event():
+    """アプリケーション終了時に共有HTTPセッションをクローズし、未保存の分析結果を書き出す"""
+    # 研究者分析モジュールは初回利用時に読み込むため、読み込み済みの場合のみクローズする
+    analyzer_module = sys.modules.get("researchmap.analyzer")
+    if analyzer_module is not None:
+        await analyzer_module.close_http_session()
+    
+    # 分析結果はバッファしてから挿入するため、再起動で失われないよう残りを書き出してから終了する
+    storage_module = sys.modules.get("analysis_storage")
+    if storage_module is not None:
+        await storage_module.shutdown_analysis_storage()
+
+def _build_root_payload(initialized: bool) -> Dict[str, Any]:
+    """ルートエンドポイントの応答（timestamp以外）を構築"""
     return {
         "message": "🚀 研究者検索API v2.1.1 サーバー稼働中（プロジェクト管理統合・パラメータ修正版）",
         "status": "healthy",
-        "timestamp": time.time(),
+        "timestamp": None,
         "version": "2.1.1",
         "endpoints": {
             "/health": "ヘルスチェック",
@@ -182,15 +305,25 @@ async def root():
             "/test_api.html": "テストツール"
         },
         "features": {
-            "search_api": "✅ 利用可能" if clients["initialized"] else "🔄 準備中",
-            "gcp_integration": "✅ 準備完了" if clients["initialized"] else "🔄 準備中",
+            "search_api": "✅ 利用可能" if initialized else "🔄 準備中",
+            "gcp_integration": "✅ 準備完了" if initialized else "🔄 準備中",
             "researchmap_analysis": "✅ 利用可能",
             "project_management": "✅ 利用可能",
             "matching_system": "✅ 利用可能"
         }
     }
 
-@app.get("/test_api.html")
+# 初期化状態ごとに事前構築しておく
+_ROOT_PAYLOADS = {initialized: _build_root_payload(initialized) for initialized in (True, False)}
+
+@app.get("/")
+async def root():
+    """ルートエンドポイント"""
+    response = dict(_ROOT_PAYLOADS[clients.initialized])
+    response["timestamp"] = time.time()
+    return response
+
+@app.get("/test_api.html", include_in_schema=False)
 async def test_api_page():
     """テストAPIページ"""
     # このファイルは静的ファイルとして配信されることを想定
@@ -203,25 +336,29 @@ async def test_api_page():
     raise HTTPException(status_code=404, detail="test_api.html not found")
 
 
-@app.get("/health")
-async def health_check():
-    """詳細なヘルスチェック"""
+# GCPステータスを含むヘルスチェック応答のキャッシュ有効期間（秒）
+HEALTH_CACHE_TTL_SECONDS = 30
+_health_cache: Dict[str, Any] = {"built_at": 0.0, "initialized": None, "payload": None}
+
+def _build_health_payload() -> Dict[str, Any]:
+    """ヘルスチェックの応答（timestamp以外）を構築"""
     try:
-        from gcp_auth import get_gcp_status
+        if not GCP_AUTH_AVAILABLE:
+            raise ImportError(GCP_AUTH_IMPORT_ERROR)
         gcp_status = get_gcp_status()
     except Exception as e:
         gcp_status = {"error": str(e)}
     
-    health_status = {
+    return {
         "status": "healthy",
-        "timestamp": time.time(),
+        "timestamp": None,
         "server_info": {
             "version": "2.1.1",
             "project_id": PROJECT_ID,
             "location": LOCATION
         },
         "clients_status": {
-            "initialized": clients["initialized"],
+            "initialized": clients.initialized,
             "bigquery": "✅ 準備完了" if gcp_status.get("bigquery_ready") else "🔄 準備中",
             "vertex_ai": "✅ 準備完了" if gcp_status.get("vertex_ai_ready") else "🔄 準備中",
             "credentials": "✅ 設定済" if gcp_status.get("credentials_available") else "❌ 未設定"
@@ -229,7 +366,7 @@ async def health_check():
         "endpoints": {
             "/": "✅ 利用可能",
             "/health": "✅ 利用可能",
-            "/api/search": "✅ 実際検索可能" if clients["initialized"] else "🔄 準備中（モック応答あり）",
+            "/api/search": "✅ 実際検索可能" if clients.initialized else "🔄 準備中（モック応答あり）",
             "/api/universities": "✅ 利用可能",
             "/api/analyze-researcher": "✅ ResearchMap分析可能",
             "/api/temp-projects": "✅ プロジェクト管理可能",
@@ -237,47 +374,82 @@ async def health_check():
         },
         "gcp_details": gcp_status
     }
+
+@app.get("/health")
+async def health_check():
+    """詳細なヘルスチェック"""
+    # 高頻度のヘルスチェックに備え、応答本体はTTL付きでキャッシュし、timestampのみ毎回更新する
+    now = time.monotonic()
+    if (
+        _health_cache["payload"] is None
+        or _health_cache["initialized"] != clients.initialized
+        or now - _health_cache["built_at"] >= HEALTH_CACHE_TTL_SECONDS
+    ):
+        _health_cache["payload"] = _build_health_payload()
+        _health_cache["initialized"] = clients.initialized
+        _health_cache["built_at"] = now
+    
+    health_status = dict(_health_cache["payload"])
+    health_status["timestamp"] = time.time()
     return health_status
 
 
+# 所属名に含まれていれば特定の大学名へ統合する名称（統合元, 統合先）
+# 所属名の中で最初に現れた統合元が使われる（東海国立大学機構は「東海国立大学」で一致する）
+UNIVERSITY_ALIASES = (
+    ("奈良先端科学技術大学院大学", "奈良先端科学技術大学院大学"),
+    ("東京工業大学", "東京科学大学"),
+    ("東京医科歯科大学", "東京科学大学"),
+    ("東海国立大学", "名古屋大学"),
+)
+
+@lru_cache(maxsize=4)
 def get_simple_university_query(table_name: str) -> str:
     """
     【最終改善版】特殊な統合ルールと、一般的な正規化を組み合わせたクエリ
+    統合ルールは1回の正規表現で統合元を取り出し、小さな対応表と突き合わせて適用する
     """
+    alias_pattern = "|".join(alias for alias, _ in UNIVERSITY_ALIASES)
+    alias_rows = ",\n        ".join(
+        f"STRUCT('{alias}' AS alias, '{canonical}' AS canonical)" for alias, canonical in UNIVERSITY_ALIASES
+    )
     return f"""
-    WITH base_data AS (
+    WITH university_aliases AS (
+      SELECT * FROM UNNEST([
+        {alias_rows}
+      ])
+    ),
+    
+    base_data AS (
       SELECT 
         main_affiliation_name_ja,
-        name_ja
+        name_ja,
+        REGEXP_EXTRACT(main_affiliation_name_ja, '({alias_pattern})') AS alias_key
       FROM `{table_name}`
       WHERE main_affiliation_name_ja IS NOT NULL AND main_affiliation_name_ja LIKE '%大学%'
     ),
     
     cleaned_names AS (
       SELECT
-        CASE
-          WHEN main_affiliation_name_ja LIKE '%奈良先端科学技術大学院大学%' THEN '奈良先端科学技術大学院大学'
-          WHEN main_affiliation_name_ja LIKE '%東京工業大学%' THEN '東京科学大学'
-          WHEN main_affiliation_name_ja LIKE '%東京医科歯科大学%' THEN '東京科学大学'
-          WHEN main_affiliation_name_ja LIKE '%東海国立大学%' THEN '名古屋大学'
-          WHEN main_affiliation_name_ja LIKE '%東海国立大学機構%' THEN '名古屋大学'
-          ELSE
-            TRIM(
-                REGEXP_REPLACE(
-                    REGEXP_REPLACE(
-                        REGEXP_REPLACE(
-                            main_affiliation_name_ja,
-                            '^(国立大学法人|学校法人|公立大学法人)\\\\s*', ''
-                        ),
-                        '／.*$', ''
-                    ),
-                    '\\\\s*(大学院|大学病院|病院|研究院|研究センター|研究科|学部|附属|特任准教授|教授|准教授|客員|機構|センター).*$', ''
-                )
-            )
-        END AS university_name,
-        name_ja,
-        main_affiliation_name_ja as original_name
-      FROM base_data
+        COALESCE(
+          a.canonical,
+          TRIM(
+              REGEXP_REPLACE(
+                  REGEXP_REPLACE(
+                      REGEXP_REPLACE(
+                          b.main_affiliation_name_ja,
+                          '^(国立大学法人|学校法人|公立大学法人)\\\\s*', ''
+                      ),
+                      '／.*$', ''
+                  ),
+                  '\\\\s*(大学院|大学病院|病院|研究院|研究センター|研究科|学部|附属|特任准教授|教授|准教授|客員|機構|センター).*$', ''
+              )
+          )
+        ) AS university_name,
+        b.name_ja,
+        b.main_affiliation_name_ja as original_name
+      FROM base_data b
+      LEFT JOIN university_aliases a ON a.alias = b.alias_key
     ),
 
     validated_universities AS (
@@ -288,7 +460,8 @@ def get_simple_university_query(table_name: str) -> str:
       FROM cleaned_names
       WHERE university_name IS NOT NULL
         AND university_name LIKE '%大学'
-        AND LENGTH(university_name) >= 3
+        AND university_name NOT LIKE '%大学大学%'
+        AND LENGTH(university_name) BETWEEN 3 AND 15
     )
     
     SELECT 
@@ -302,92 +475,187 @@ def get_simple_university_query(table_name: str) -> str:
     LIMIT 100
     """
 
+
+@lru_cache(maxsize=4)
+def get_university_summary_query(summary_table: str) -> str:
+    """要約テーブルから大学リストを読むクエリ（100行程度のテーブルのみを読む）"""
+    return f"""
+    SELECT university_name, researcher_count, original_names
+    FROM `{summary_table}`
+    ORDER BY researcher_count DESC
+    LIMIT 100
+    """
+
+
+def get_university_summary_refresh_statement(source_table: str, summary_table: str) -> str:
+    """
+    要約テーブルを作り直すSQL（BigQueryのスケジュールクエリとして日次で実行する）
+    集計内容は get_simple_university_query と同一
+    """
+    return f"CREATE OR REPLACE TABLE `{summary_table}` AS\n{get_simple_university_query(source_table)}"
+
+# 大学リストのキャッシュ（テーブル名 → (有効期限, シリアライズ済みレスポンス)）
+# 集計結果は頻繁に変わらないため長めに保持し、フォールバック応答は短時間で再試行させる
+# キャッシュヒット時はJSONへの変換も省略できるよう、シリアライズ後のバイト列を保持する
+UNIVERSITIES_CACHE_TTL_SECONDS = 6 * 60 * 60
+UNIVERSITIES_FALLBACK_CACHE_TTL_SECONDS = 60
+_universities_cache: Dict[str, Tuple[float, bytes]] = {}
+_universities_lock = asyncio.Lock()
+
+def _get_cached_universities() -> Optional[Response]:
+    """有効期限内のキャッシュ済み大学リストを取得"""
+    cached = _universities_cache.get(BIGQUERY_TABLE)
+    if cached and time.monotonic() < cached[0]:
+        return Response(content=cached[1], media_type="application/json")
+    return None
+
+def _require_admin_token(token: Optional[str]):
+    """管理者トークンを検証し、一致しない場合は403を返す"""
+    if not ADMIN_API_TOKEN or token is None or not secrets.compare_digest(token, ADMIN_API_TOKEN):
+        raise HTTPException(status_code=403, detail="管理者トークンが必要です")
+
 @app.get("/api/universities")
-async def get_universities():
+async def get_universities(
+    refresh: bool = Query(False, description="キャッシュを使わずに再集計する（管理者トークンが必要）"),
+    x_admin_token: Optional[str] = Header(None)
+):
     """
     登録されている大学名とその研究者数を取得
+    BigQueryの集計結果はTTL付きでキャッシュする
+    """
+    # 再集計は全件スキャンのクエリを伴うため、管理者のみに許可する
+    if refresh:
+        _require_admin_token(x_admin_token)
+    
+    if not refresh:
+        cached = _get_cached_universities()
+        if cached is not None:
+            logger.info("⚡ 大学リストキャッシュヒット")
+            return cached
+    
+    # 同時に複数の集計クエリが走らないよう、取得処理は1つずつ実行する
+    async with _universities_lock:
+        if not refresh:
+            cached = _get_cached_universities()
+            if cached is not None:
+                logger.info("⚡ 大学リストキャッシュヒット")
+                return cached
+        
+        logger.info("🔄 大学リストキャッシュミス - BigQueryから取得")
+        response = await _load_universities()
+        ttl = UNIVERSITIES_CACHE_TTL_SECONDS if response.get("status") == "success" else UNIVERSITIES_FALLBACK_CACHE_TTL_SECONDS
+        body = orjson.dumps(response)
+        _universities_cache[BIGQUERY_TABLE] = (time.monotonic() + ttl, body)
+        return Response(content=body, media_type="application/json")
+
+@app.post("/api/universities/invalidate", include_in_schema=False)
+async def invalidate_universities_cache(x_admin_token: Optional[str] = Header(None)):
+    """大学リストのキャッシュを破棄（管理者トークンが必要）"""
+    _require_admin_token(x_admin_token)
+    removed = _universities_cache.pop(BIGQUERY_TABLE, None) is not None
+    logger.info("🧹 大学リストキャッシュ破棄: %s", removed)
+    return {"status": "success", "invalidated": removed}
+
+def _build_university_entry(university_name: str, researcher_count: int, original_names: Optional[List[str]], merge_info: Optional[str]) -> Dict[str, Any]:
+    """大学リストの1件分を構築"""
+    university_data = {
+        "name": university_name,
+        "count": researcher_count,
+        "is_merged": bool(merge_info)
+    }
+    if merge_info:
+        university_data["merge_info"] = merge_info
+    if original_names:
+        university_data["original_names"] = original_names
+    return university_data
+
+def _run_universities_query_sync(bq_client, query: str) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    大学集計クエリを実行し、レスポンス用の大学リストと統合情報まで組み立てる（ブロッキング）
+    戻り値: (取得行数, 大学リスト, 統合詳細)
+    """
+    # 行ごとのRow生成を避け、Arrow（Storage Read API利用可能時はgRPC）で列単位に取得する
+    table = bq_client.query(query).result().to_arrow(
+        bqstorage_client=get_bqstorage_client(),
+        create_bqstorage_client=False
+    )
+    
+    # 異常な大学名（重複・「大学」で終わらない名前）はクエリ側で除外済み
+    column_names = set(table.column_names)
+    university_names = table.column("university_name").to_pylist()
+    researcher_counts = table.column("researcher_count").to_pylist()
+    original_names_list = table.column("original_names").to_pylist() if "original_names" in column_names else repeat(None)
+    merge_infos = table.column("merge_info").to_pylist() if "merge_info" in column_names else repeat(None)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        # デバッグ時のみ、クエリ側の除外条件が効いているかを確認する
+        anomalies = [name for name in university_names if not name.endswith("大学") or "大学大学" in name]
+        if anomalies:
+            logger.debug("⚠️ クエリ側で除外されるべき大学名が含まれています: %s", anomalies)
+    
+    rows = list(zip(university_names, researcher_counts, original_names_list, merge_infos))
+    universities = [
+        _build_university_entry(university_name, researcher_count, original_names, merge_info_value)
+        for university_name, researcher_count, original_names, merge_info_value in rows
+    ]
+    normalization_details = [
+        {
+            "normalized_name": university_name,
+            "original_names": original_names,
+            "consolidated_count": researcher_count,
+            "merge_info": merge_info_value
+        }
+        for university_name, researcher_count, original_names, merge_info_value in rows
+        if original_names and len(original_names) > 1
+    ]
+    return table.num_rows, universities, normalization_details
+
+async def _load_universities() -> Dict[str, Any]:
+    """
+    登録されている大学名とその研究者数をBigQueryから取得
     シンプル修正版
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         logger.info("🏫 大学リスト取得開始（シンプル修正版）")
         
-        try:
-            from gcp_auth import get_bigquery_client, get_gcp_status
-            logger.info("✅ シンプル統合クエリを使用")
-        except ImportError as e:
-            logger.error(f"❌ モジュールインポートエラー: {e}")
-            return await get_universities_fallback("module_import_error", str(e))
+        if not GCP_AUTH_AVAILABLE:
+            logger.error("❌ モジュールインポートエラー: %s", GCP_AUTH_IMPORT_ERROR)
+            return await get_universities_fallback("module_import_error", GCP_AUTH_IMPORT_ERROR)
+        logger.info("✅ シンプル統合クエリを使用")
         
         gcp_status = get_gcp_status()
-        logger.info(f"📊 GCP状況: {gcp_status}")
+        logger.info("📊 GCP状況: %s", gcp_status)
         
-        bq_client = get_bigquery_client()
+        # 未初期化の場合はここでGCP初期化が走るため、イベントループを塞がないようスレッドで実行
+        bq_client = await asyncio.to_thread(get_bigquery_client)
         
         if not bq_client:
             logger.warning("⚠️ BigQueryクライアントが利用できません - フォールバックモード")
             return await get_universities_fallback("bigquery_unavailable", "BigQueryクライアントが初期化されていません")
         
         try:
-            query = get_simple_university_query(BIGQUERY_TABLE)
-            logger.info(f"✅ シンプルクエリ生成成功: {len(query)}文字")
+            if UNIVERSITIES_SUMMARY_TABLE:
+                query = get_university_summary_query(UNIVERSITIES_SUMMARY_TABLE)
+            else:
+                query = get_simple_university_query(BIGQUERY_TABLE)
             
             logger.info("🔍 BigQueryクエリ実行開始")
-            query_job = bq_client.query(query)
-            
-            universities = []
-            normalization_details = []
-            row_count = 0
             
             logger.info("⏳ クエリ結果の処理中...")
             
-            for row in query_job:
-                row_count += 1
-                
-                if not row.university_name or "大学大学" in row.university_name:
-                    if row.university_name:
-                        logger.warning(f"⚠️ 異常な大学名をスキップ: {row.university_name}")
-                    continue
-                
-                if not row.university_name.endswith('大学'):
-                    logger.warning(f"⚠️ 不正な大学名をスキップ: {row.university_name}")
-                    continue
-                
-                university_data = {
-                    "name": row.university_name,
-                    "count": row.researcher_count
-                }
-                
-                if hasattr(row, 'merge_info') and row.merge_info:
-                    university_data["merge_info"] = row.merge_info
-                    university_data["is_merged"] = True
-                else:
-                    university_data["is_merged"] = False
-                
-                if hasattr(row, 'original_names') and row.original_names:
-                    university_data["original_names"] = row.original_names
-                    if len(row.original_names) > 1:
-                        normalization_details.append({
-                            "normalized_name": row.university_name,
-                            "original_names": row.original_names,
-                            "consolidated_count": row.researcher_count,
-                            "merge_info": getattr(row, 'merge_info', None)
-                        })
-                
-                universities.append(university_data)
-                
-                if len(universities) <= 10:
-                    merge_info = ""
-                    if hasattr(row, 'merge_info') and row.merge_info:
-                        merge_info = f" 🔗統合: {row.merge_info}"
-                    elif hasattr(row, 'original_names') and row.original_names and len(row.original_names) > 1:
-                        merge_info = f" (統合: {len(row.original_names)}校)"
-                    logger.info(f"  {len(universities)}. {row.university_name}: {row.researcher_count:,}名{merge_info}")
+            # クエリの完了待ち・結果取得・一覧の組み立てはいずれもブロッキングのため、まとめてスレッドで実行する
+            row_count, universities, normalization_details = await asyncio.to_thread(
+                _run_universities_query_sync, bq_client, query
+            )
+            logger.info("🏫 上位10校: %s", [u["name"] for u in universities[:10]])
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
-            tokyo_kagaku = next((u for u in universities if u["name"] == "東京科学大学"), None)
+            # 統合対象の大学を名前で引けるよう索引を一度だけ作る
+            universities_by_name = {u["name"]: u for u in universities}
+            tokyo_kagaku = universities_by_name.get("東京科学大学")
             
             response = {
                 "status": "success",
@@ -435,72 +703,74 @@ async def get_universities():
             total_integration_count = len(normalization_details)
             
             if tokyo_kagaku:
-                logger.info(f"🔗 東京科学大学統合成功: {tokyo_kagaku['count']:,}名")
+                logger.info("🔗 東京科学大学統合成功: %s名", format(tokyo_kagaku['count'], ","))
             
-            logger.info(f"✅ 大学リスト取得完了: {len(universities)}校 (特別統合: {merged_count}校, 一般統合: {total_integration_count}校) {execution_time:.2f}秒")
+            logger.info("✅ 大学リスト取得完了: %s校 (特別統合: %s校, 一般統合: %s校) %.2f秒", len(universities), merged_count, total_integration_count, execution_time)
             return response
             
         except Exception as e:
-            logger.error(f"❌ BigQueryクエリ実行エラー: {e}")
-            import traceback
-            logger.error(f"📋 エラーの詳細: {traceback.format_exc()}")
+            logger.error("❌ BigQueryクエリ実行エラー: %s", e, exc_info=True)
             if 'query' in locals():
-                logger.error(f"🔎 エラー発生クエリ: {query}")
+                logger.error("🔎 エラー発生クエリ: %s", query)
             return await get_universities_fallback("bigquery_execution_error", str(e))
             
     except Exception as e:
-        logger.error(f"❌ 大学リスト取得で予期しないエラー: {e}")
-        import traceback
-        logger.error(f"📋 エラーの詳細: {traceback.format_exc()}")
+        logger.error("❌ 大学リスト取得で予期しないエラー: %s", e, exc_info=True)
         return await get_universities_fallback("unexpected_error", str(e))
 
+# フォールバック応答の固定部分（呼び出し間で共有するため、変更されないようタプルで保持）
+_FALLBACK_UNIVERSITIES = (
+    {"name": "京都大学", "count": 6264, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "東京大学", "count": 5113, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "大阪大学", "count": 4542, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "東京科学大学", "count": 3503, "note": "完全統合版（統合後）", "is_merged": True, "merge_info": "東京工業大学 + 東京医科歯科大学 + 東京科学大学"},
+    {"name": "北海道大学", "count": 3515, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "東北大学", "count": 3426, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "九州大学", "count": 2486, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "筑波大学", "count": 2471, "note": "完全統合版（実データベース）", "is_merged": False},
+    {"name": "名古屋大学", "count": 2317, "note": "完全統合版（実データベース）", "is_merged": False}
+)
+
+_FALLBACK_NORMALIZATION_INFO = {
+    "method": "complete_university_integration_v4",
+    "rules": [
+        "🔗 東京科学大学統合: 東京工業大学 + 東京医科歯科大学 + 東京科学大学",
+        "🌏 東海国立大学機構統合: 東海国立大学機構(名古屋大学+岐阜大学) → 名古屋大学",
+        "🏛️ 国立大学法人の除去と統合処理",
+        "🧹 附属機関除外: 大学院・病院・研究科・センター等を親大学に統合",
+        "✂️ 異常パターン除外: 重複・空文字・短すぎる名前",
+        "🔍 負の先読み正規表現で確実な親大学名抽出"
+    ],
+    "consolidated_universities": 25,
+    "tokyo_kagaku_integration": { "success": True, "count": 3503, "sources": "東京工業大学 + 東京医科歯科大学 + 東京科学大学" },
+    "tokai_national_integration": { "rule": "東海国立大学機構 (名古屋大学+岐阜大学) → 名古屋大学", "reason": "名古屋大学が主要構成大学のため" },
+    "note": "完全統合対応の大学名抽出システム"
+}
+
 async def get_universities_fallback(error_type: str, error_message: str):
     """
     大学リスト取得のフォールバック機能
     """
-    logger.warning(f"🔄 フォールバックモード実行: {error_type}")
-    
-    mock_universities = [
-        {"name": "京都大学", "count": 6264, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "東京大学", "count": 5113, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "大阪大学", "count": 4542, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "東京科学大学", "count": 3503, "note": "完全統合版（統合後）", "is_merged": True, "merge_info": "東京工業大学 + 東京医科歯科大学 + 東京科学大学"},
-        {"name": "北海道大学", "count": 3515, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "東北大学", "count": 3426, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "九州大学", "count": 2486, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "筑波大学", "count": 2471, "note": "完全統合版（実データベース）", "is_merged": False},
-        {"name": "名古屋大学", "count": 2317, "note": "完全統合版（実データベース）", "is_merged": False}
-    ]
+    logger.warning("🔄 フォールバックモード実行: %s", error_type)
     
+    # 固定部分はモジュール定数を共有し、呼び出しごとに異なる fallback_info だけを組み立てる
     return {
         "status": "fallback",
-        "total_universities": len(mock_universities),
-        "universities": mock_universities,
+        "total_universities": len(_FALLBACK_UNIVERSITIES),
+        "universities": _FALLBACK_UNIVERSITIES,
         "fallback_info": {
             "reason": error_type,
             "error_message": error_message,
             "note": "これは完全統合版の期待結果です。東京科学大学統合が正しく動作し、4位にランクインします。"
         },
-        "normalization_info": {
-            "method": "complete_university_integration_v4",
-            "rules": [
-                "🔗 東京科学大学統合: 東京工業大学 + 東京医科歯科大学 + 東京科学大学",
-                "🌏 東海国立大学機構統合: 東海国立大学機構(名古屋大学+岐阜大学) → 名古屋大学",
-                "🏛️ 国立大学法人の除去と統合処理",
-                "🧹 附属機関除外: 大学院・病院・研究科・センター等を親大学に統合",
-                "✂️ 異常パターン除外: 重複・空文字・短すぎる名前",
-                "🔍 負の先読み正規表現で確実な親大学名抽出"
-            ],
-            "consolidated_universities": 25,
-            "tokyo_kagaku_integration": { "success": True, "count": 3503, "sources": "東京工業大学 + 東京医科歯科大学 + 東京科学大学" },
-            "tokai_national_integration": { "rule": "東海国立大学機構 (名古屋大学+岐阜大学) → 名古屋大学", "reason": "名古屋大学が主要構成大学のため" },
-            "note": "完全統合対応の大学名抽出システム"
-        }
+        "normalization_info": _FALLBACK_NORMALIZATION_INFO
     }
 
 def get_researcher_data_by_url(url: str) -> Optional[Dict[str, Any]]:
     """researchmap_urlをキーにBigQueryから研究者データを取得する"""
-    from gcp_auth import get_bigquery_client
+    if not GCP_AUTH_AVAILABLE:
+        logger.error("BigQuery client not available for summary generation.")
+        return None
     bq_client = get_bigquery_client()
     if not bq_client:
         logger.error("BigQuery client not available for summary generation.")
@@ -514,92 +784,204 @@ def get_researcher_data_by_url(url: str) -> Optional[Dict[str, Any]]:
     )
     
     try:
-        logger.info(f"Querying BigQuery for researcher with URL: {url}")
-        query_job = bq_client.query(query, job_config=job_config)
-        results = query_job.to_dataframe()
-        if results.empty:
-            logger.warning(f"No researcher data found for URL: {url}")
+        logger.info("Querying BigQuery for researcher with URL: %s", url)
+        # 1行だけ取得すればよいため、DataFrameを介さずRowを直接辞書にする
+        rows = list(bq_client.query(query, job_config=job_config).result(max_results=1))
+        if not rows:
+            logger.warning("No researcher data found for URL: %s", url)
             return None
         
-        researcher_dict = results.iloc[0].where(pd.notnull(results.iloc[0]), None).to_dict()
+        # NaNはNoneに揃える（NaN != NaN を利用して判定）
+        researcher_dict = {
+            key: (None if isinstance(value, float) and value != value else value)
+            for key, value in rows[0].items()
+        }
         return researcher_dict
     except Exception as e:
-        logger.error(f"BigQueryからのデータ取得に失敗: {e}")
+        logger.error("BigQueryからのデータ取得に失敗: %s", e, exc_info=True)
         return None
 
 # --- ここからが復元された正しいエンドポイント ---
-@app.post("/api/generate-summary")
-async def generate_single_summary(request: SummaryRequest):
+# まとめて要約を生成する際の同時LLM呼び出し数
+BATCH_SUMMARY_CONCURRENCY = 8
+
+def _get_summary_evaluator():
     """
-    AI要約を生成する。
+    要約に使う評価システムを取得
+    要約キャッシュを共有するため、起動時に読み込んだ検索と同じインスタンスを優先して使い、
+    検索機能の読み込みに失敗していた場合は初回利用時に単独で構築する
+    """
+    global search_evaluator
+    if search_evaluator is None:
+        from evaluation_system import UniversalResearchEvaluator
+        search_evaluator = UniversalResearchEvaluator()
+        logger.info("✅ 要約用の評価システムを個別に初期化しました")
+    return search_evaluator
+
+async def _generate_summary(request: SummaryRequest) -> Tuple[int, Dict[str, Any]]:
+    """
+    1件分のAI要約を生成し、(HTTPステータス, 応答内容) を返す。
     フロントエンドから研究者情報が提供された場合は、DBアクセスをスキップする。
     """
-    logger.info(f"🤖 AI要約生成リクエスト受信: {request.researchmap_url} (Query: {request.query})")
-    
     researcher_data = None
     
     if request.researcher_info:
         logger.info("✅ フロントエンド提供の情報を使用。DBアクセスをスキップします。")
-        researcher_data = request.researcher_info.dict(exclude_unset=True, by_alias=False) # by_alias=FalseでPythonのフィールド名を使う
+        researcher_data = request.researcher_info.model_dump(exclude_unset=True, by_alias=False) # by_alias=FalseでPythonのフィールド名を使う
     else:
-        logger.warning(f"⚠️ フロントエンドからの情報提供なし。DBからデータを取得します: {request.researchmap_url}")
-        researcher_data = get_researcher_data_by_url(request.researchmap_url)
+        logger.warning("⚠️ フロントエンドからの情報提供なし。DBからデータを取得します: %s", request.researchmap_url)
+        # BigQueryの往復でイベントループを塞がないよう、スレッドで実行する
+        researcher_data = await asyncio.to_thread(get_researcher_data_by_url, request.researchmap_url)
     
     if not researcher_data:
         error_msg = "指定されたURLの研究者データが見つかりませんでした。"
-        logger.error(error_msg + f" URL: {request.researchmap_url}")
-        return JSONResponse(
-            status_code=404,
-            content={"status": "error", "error": error_msg}
-        )
+        logger.error("%s URL: %s", error_msg, request.researchmap_url)
+        return 404, {"status": "error", "error": error_msg}
         
+    # 想定内の失敗は例外を経由せずに応答し、スタックトレースの記録は想定外の例外に限る
     try:
-        from evaluation_system import UniversalResearchEvaluator
-        evaluator = UniversalResearchEvaluator()
-        
-        summary_text = await evaluator.generate_single_summary(researcher_data, request.query)
-        
-        if summary_text:
-            logger.info(f"✅ AI要約生成成功: {request.researchmap_url}")
-            return {"status": "success", "summary": summary_text}
-        else:
-            raise Exception("LLMからの要約取得に失敗しました。")
-
-    except Exception as e:
-        logger.error(f"❌ AI要約生成中にエラー: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"status": "error", "error": f"要約の生成中にサーバーエラーが発生しました: {str(e)}"}
+        summary_text = await _get_summary_evaluator().generate_single_summary(
+            researcher_data,
+            request.query,
+            researchmap_url=request.researchmap_url
         )
+    except Exception as e:
+        logger.error("❌ AI要約生成中にエラー: %s", e, exc_info=True)
+        return 500, {"status": "error", "error": f"要約の生成中にサーバーエラーが発生しました: {str(e)}"}
+    
+    if not summary_text:
+        logger.error("❌ AI要約生成中にエラー: LLMからの要約取得に失敗しました。")
+        return 500, {"status": "error", "error": "要約の生成中にサーバーエラーが発生しました: LLMからの要約取得に失敗しました。"}
+    
+    logger.info("✅ AI要約生成成功: %s", request.researchmap_url)
+    return 200, {"status": "success", "summary": summary_text}
+
+@app.post("/api/generate-summary")
+async def generate_single_summary(request: SummaryRequest):
+    """
+    AI要約を生成する。
+    フロントエンドから研究者情報が提供された場合は、DBアクセスをスキップする。
+    """
+    logger.info("🤖 AI要約生成リクエスト受信: %s (Query: %s)", request.researchmap_url, request.query)
+    
+    status_code, content = await _generate_summary(request)
+    if status_code != 200:
+        return ORJSONResponse(status_code=status_code, content=content)
+    return content
+
+@app.post("/api/generate-summaries")
+async def generate_summaries(request: BatchSummaryRequest):
+    """
+    複数研究者のAI要約をまとめて生成する。
+    同じ (researchmap_url, query) は1回だけ生成し、LLM呼び出しは同時実行数を制限して並列に行う。
+    """
+    logger.info("🤖 AI要約一括生成リクエスト受信: %s件", len(request.items))
+    
+    unique_items: Dict[Tuple[str, str], SummaryRequest] = {}
+    for item in request.items:
+        unique_items.setdefault((item.researchmap_url, item.query), item)
+    
+    semaphore = asyncio.Semaphore(BATCH_SUMMARY_CONCURRENCY)
+    
+    async def summarize(item: SummaryRequest) -> Dict[str, Any]:
+        async with semaphore:
+            _, content = await _generate_summary(item)
+        return content
+    
+    contents = await asyncio.gather(*(summarize(item) for item in unique_items.values()))
+    content_by_key = dict(zip(unique_items.keys(), contents))
+    
+    return {
+        "status": "success",
+        "results": [
+            {"researchmap_url": item.researchmap_url, "query": item.query, **content_by_key[(item.researchmap_url, item.query)]}
+            for item in request.items
+        ]
+    }
 
 # --- ここまでが復元された正しいエンドポイント ---
 
+# モック検索（フォールバック）用の研究者テンプレート
+# (固定フィールド, {query} を埋め込むフィールドの書式)
+_MOCK_RESEARCHER_TEMPLATES = (
+    (
+        { "main_affiliation_name_ja": "サンプル大学", "researchmap_url": "https://researchmap.jp/sample1", "distance": 0.1234 },
+        { "name_ja": "研究者A（関連: {query}）", "research_keywords_ja": "{query}, 機械学習" }
+    ),
+    (
+        { "main_affiliation_name_ja": "先端技術研究所", "researchmap_url": "https://researchmap.jp/sample2", "distance": 0.2156 },
+        { "name_ja": "研究者B（関連: {query}）", "research_keywords_ja": "{query}, 応用研究" }
+    ),
+)
+_MOCK_LLM_SUMMARY_TEMPLATE = "この研究者は「{query}」に関して深い専門知識を有しています。"
+_MOCK_EXECUTED_QUERY_INFO = "モック検索実行（実際の検索は準備中）"
+# ResearcherResult と同じキー構成（未設定はNone）で直接JSON化するためのベース
+_MOCK_RESULT_BASE = dict.fromkeys(ResearcherResult.model_fields)
+
+# 検索結果キャッシュ（同一条件の検索でBigQuery・Vertex AIの呼び出しを省略する。値は検証済みのレスポンス辞書）
+SEARCH_CACHE_MAXSIZE = 1024
+SEARCH_CACHE_TTL_SECONDS = 300
+_search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL_SECONDS)
+
+def _search_cache_key(request: SearchRequest) -> tuple:
+    """検索結果に影響する全ての条件からキャッシュキーを作成"""
+    return (
+        request.query.strip(),
+        request.method,
+        request.max_results,
+        tuple(request.exclude_keywords or ()),
+        request.use_llm_expansion,
+        request.use_llm_summary,
+        request.use_internal_evaluation,
+        request.young_researcher_filter,
+        tuple(request.university_filter or ()),
+    )
+
 @app.post("/api/search", response_model=SearchResponse)
 async def search_researchers(request: SearchRequest):
     """
     研究者検索APIエンドポイント（実際の検索 + フォールバック）
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    logger.info(f"🔍 検索リクエスト受信: query={request.query}, method={request.method}, max_results={request.max_results}")
+    logger.info("🔍 検索リクエスト受信: query=%s, method=%s, max_results=%s", request.query, request.method, request.max_results)
     if request.university_filter:
-        logger.info(f"🏫 大学フィルター: {request.university_filter}")
+        logger.info("🏫 大学フィルター: %s", request.university_filter)
     if request.exclude_keywords:
-        logger.info(f"🚫 除外キーワード: {request.exclude_keywords}")
+        logger.info("🚫 除外キーワード: %s", request.exclude_keywords)
 
-    try:
-        from real_search import perform_real_search
-        result = await perform_real_search(request)
-        
-        if result["status"] == "success":
-            logger.info(f"✅ 実際の検索成功: {len(result.get('results', []))}件")
-            return SearchResponse(**result)
-        else:
-            logger.warning(f"⚠️ 実際の検索失敗、モックにフォールバック: {result.get('error_message')}")
+    cache_key = _search_cache_key(request)
+    cached_payload = _search_cache.get(cache_key)
+    if cached_payload is not None:
+        logger.info("⚡ 検索結果キャッシュヒット: %s件", cached_payload["total"])
+        # 検証済みの辞書をそのまま返し、response_modelでの再検証を省略する
+        return ORJSONResponse({**cached_payload, "execution_time": time.perf_counter() - start_time})
+    
+    if perform_real_search is not None:
+        try:
+            result = await perform_real_search(request)
             
-    except Exception as e:
-        import traceback
-        logger.error(f"⚠️ 実際の検索でエラー、モックにフォールバック: {e}\n{traceback.format_exc()}")
+            if result["status"] == "success":
+                logger.info("✅ 実際の検索成功: %s件", len(result.get('results', [])))
+                # 結果の各行は real_search 側で型を揃えて組み立てているため、検証を省略してモデルを構築する
+                # （余分なカラムは破棄され、欠けたフィールドは既定値で埋まる）
+                # モックや途中でフォールバックした結果はキャッシュせず、要求どおりの検索結果のみ辞書として保持・返却する
+                payload = SearchResponse.model_construct(**{
+                    **result,
+                    "results": [ResearcherResult.model_construct(**r) for r in result["results"]]
+                }).model_dump()
+                if result.get("degraded"):
+                    logger.info("⚠️ フォールバックを含む検索結果のためキャッシュしません")
+                else:
+                    _search_cache[cache_key] = payload
+                return ORJSONResponse(payload)
+            else:
+                logger.warning("⚠️ 実際の検索失敗、モックにフォールバック: %s", result.get('error_message'))
+                
+        except Exception as e:
+            logger.error("⚠️ 実際の検索でエラー、モックにフォールバック: %s", e, exc_info=True)
+    else:
+        logger.warning("⚠️ 実際の検索機能が読み込まれていないため、モックにフォールバック")
     
     # モック検索（フォールバック）
     mock_results = []
@@ -614,39 +996,41 @@ async def search_researchers(request: SearchRequest):
                 "expanded_query": " ".join(mock_expanded_keywords)
             }
         
-        mock_researchers = [
-            { "name_ja": f"研究者A（関連: {request.query}）", "main_affiliation_name_ja": "サンプル大学", "research_keywords_ja": f"{request.query}, 機械学習", "researchmap_url": "https://researchmap.jp/sample1", "distance": 0.1234 },
-            { "name_ja": f"研究者B（関連: {request.query}）", "main_affiliation_name_ja": "先端技術研究所", "research_keywords_ja": f"{request.query}, 応用研究", "researchmap_url": "https://researchmap.jp/sample2", "distance": 0.2156 }
+        # 必要な件数分だけ、クエリを埋め込むフィールドとAI要約を含めて1回の走査で組み立てる
+        templates = _MOCK_RESEARCHER_TEMPLATES[:min(request.max_results, len(_MOCK_RESEARCHER_TEMPLATES))]
+        llm_summary = _MOCK_LLM_SUMMARY_TEMPLATE.format(query=request.query) if request.use_llm_summary else None
+        mock_results = [
+            {
+                **_MOCK_RESULT_BASE,
+                **static_fields,
+                **{key: fmt.format(query=request.query) for key, fmt in query_fields.items()},
+                "llm_summary": llm_summary
+            }
+            for static_fields, query_fields in templates
         ]
-        
-        mock_results = mock_researchers[:min(request.max_results, len(mock_researchers))]
-        
-        if request.use_llm_summary:
-            for result in mock_results:
-                result["llm_summary"] = f"この研究者は「{request.query}」に関して深い専門知識を有しています。"
-    
-    execution_time = time.time() - start_time
-    
-    executed_query_info = f"モック検索実行（実際の検索は準備中）"
-    
-    return SearchResponse(
-        status="success",
-        query=request.query,
-        method=request.method,
-        results=[ResearcherResult(**result) for result in mock_results],
-        total=len(mock_results),
-        execution_time=execution_time,
-        executed_query_info=executed_query_info,
-        expanded_info=expanded_info
-    )
+    
+    execution_time = time.perf_counter() - start_time
+    
+    # モックデータは型が確定しているため、モデル構築とresponse_modelでの再検証を省略して直接返す
+    # （レスポンスの形は SearchResponse と同じ）
+    return ORJSONResponse({
+        "status": "success",
+        "query": request.query,
+        "method": request.method,
+        "results": mock_results,
+        "total": len(mock_results),
+        "execution_time": execution_time,
+        "executed_query_info": _MOCK_EXECUTED_QUERY_INFO,
+        "expanded_info": expanded_info
+    })
 
 @app.post("/api/analyze-researcher", response_model=AnalysisResponse)
 async def analyze_researcher(request: AnalyzeRequest):
     """
     ResearchMap APIを使用した研究者詳細分析エンドポイント
     """
-    start_time = time.time()
-    logger.info(f"🔍 研究者分析リクエスト受信: {request.researchmap_url}, query: {request.query}")
+    start_time = time.perf_counter()
+    logger.info("🔍 研究者分析リクエスト受信: %s, query: %s", request.researchmap_url, request.query)
     try:
         from researchmap.analyzer import ResearchMapAnalyzer
         analyzer = ResearchMapAnalyzer()
@@ -656,144 +1040,236 @@ async def analyze_researcher(request: AnalyzeRequest):
             basic_info=request.researcher_basic_info,
             include_keyword_map=request.include_keyword_map
         )
-        logger.info(f"✅ 研究者分析完了: {(time.time() - start_time):.2f}秒")
-        return AnalysisResponse(**result)
+        logger.info("✅ 研究者分析完了: %.2f秒", time.perf_counter() - start_time)
+        # 分析結果（論文一覧・キーワードマップ等）は大きいため、検証は構築時の一度だけとし
+        # response_modelでの再検証・再シリアライズを省略して返す
+        return ORJSONResponse(AnalysisResponse(**result).model_dump())
     except Exception as e:
-        logger.error(f"❌ 研究者分析で予期しないエラー: {e}")
-        import traceback
-        logger.error(f"📋 エラーの詳細: {traceback.format_exc()}")
-        return AnalysisResponse(status="error", error=f"予期しないエラーが発生しました: {str(e)}", analysis=None)
+        logger.error("❌ 研究者分析で予期しないエラー: %s", e, exc_info=True)
+        return ORJSONResponse({"status": "error", "analysis": None, "error": f"予期しないエラーが発生しました: {str(e)}"})
 
 # =============================================================================
 # プロジェクト管理API エンドポイント
 # =============================================================================
 
+# project_manager はメモリ内の辞書操作のみでブロッキングI/Oを含まないため、
+# スレッドへ逃がさずイベントループ上で直接呼び出す（スレッド間で辞書を共有する競合も避けられる）
 @app.post("/api/temp-projects", response_model=TempProject)
 async def create_temp_project(request: ProjectCreateRequest):
     """仮プロジェクトを作成"""
-    try:
-        project = project_manager.create_temp_project(request)
-        return project
-    except Exception as e:
-        logger.error(f"❌ 仮プロジェクト作成エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    project = project_manager.create_temp_project(request)
+    # project_manager が構築した検証済みモデルのため、response_modelでの再検証を省略して返す
+    return ORJSONResponse(project.model_dump())
+
+# 仮プロジェクトの条件付きGET（変更が無ければ304で本文を返さない）
+# 更新直後の変更を確実に反映するため、ブラウザには毎回ETagで再検証させる
+PROJECT_CACHE_CONTROL = "private, no-cache"
+# 版番号はプロセスごとに0から数えるため、再起動やワーカー違いで同じETagにならないよう起動時刻を含める
+_PROJECT_LIST_ETAG_PREFIX = format(time.time_ns(), "x")
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match に指定のETagが含まれるか判定"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+def _not_modified(etag: str) -> Response:
+    """304応答を作成"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PROJECT_CACHE_CONTROL})
+
+# 仮プロジェクト一覧の応答キャッシュ（(user_id, view) → (版番号, シリアライズ済み応答)）
+# project_manager の版番号が変わるまでは、並べ替えとシリアライズを省略して同じ応答を返す
+PROJECT_LIST_CACHE_MAXSIZE = 256
+_project_list_cache: LRUCache = LRUCache(maxsize=PROJECT_LIST_CACHE_MAXSIZE)
 
 @app.get("/api/temp-projects")
-async def list_temp_projects(user_id: Optional[str] = Query(None)):
+async def list_temp_projects(
+    request: Request,
+    user_id: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query("full", description="summary: 一覧表示用の項目（id・名前・ステータス・研究者数・日時）のみ")
+):
     """仮プロジェクト一覧を取得"""
-    try:
-        projects = project_manager.list_temp_projects(user_id)
-        return {"status": "success", "projects": projects, "total": len(projects)}
-    except Exception as e:
-        logger.error(f"❌ 仮プロジェクト一覧取得エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    version = project_manager.version
+    # 一覧はプロジェクトデータの版番号が変わらない限り同じ内容になる
+    etag = f'W/"{_PROJECT_LIST_ETAG_PREFIX}-{version}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    
+    cache_key = (user_id, view)
+    cached = _project_list_cache.get(cache_key)
+    if cached is None or cached[0] != version:
+        if view == "summary":
+            projects = project_manager.list_temp_projects_summary(user_id)
+        else:
+            projects = [project.model_dump() for project in project_manager.list_temp_projects(user_id)]
+        body = orjson.dumps({
+            "status": "success",
+            "projects": projects,
+            "total": len(projects)
+        })
+        cached = (version, body)
+        _project_list_cache[cache_key] = cached
+    return Response(content=cached[1], media_type="application/json", headers={"ETag": etag, "Cache-Control": PROJECT_CACHE_CONTROL})
 
 @app.get("/api/temp-projects/{project_id}")
-async def get_temp_project(project_id: str):
+async def get_temp_project(project_id: str, request: Request):
     """特定の仮プロジェクトを取得"""
-    try:
-        project = project_manager.get_temp_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
-        return {"status": "success", "project": project}
-    except Exception as e:
-        logger.error(f"❌ 仮プロジェクト取得エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    project = project_manager.get_temp_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    
+    # プロジェクトへの変更は必ず updated_at を更新するため、更新日時をETagにする
+    etag = f'W/"{project.updated_at or project.created_at}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return ORJSONResponse(
+        {"status": "success", "project": project.model_dump()},
+        headers={"ETag": etag, "Cache-Control": PROJECT_CACHE_CONTROL}
+    )
 
 @app.post("/api/temp-projects/{project_id}/researchers")
 async def add_researcher_to_project(project_id: str, request: ResearcherSelectionRequest):
     """プロジェクトに研究者を追加"""
-    try:
-        researcher_data = request.dict()
-        success = project_manager.add_researcher_to_project(project_id, researcher_data)
-        if not success:
-            raise HTTPException(status_code=400, detail="研究者の追加に失敗しました")
-        return {"status": "success", "message": "研究者をプロジェクトに追加しました"}
-    except Exception as e:
-        logger.error(f"❌ 研究者追加エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = project_manager.add_researcher_to_project(project_id, request)
+    if not success:
+        raise HTTPException(status_code=400, detail="研究者の追加に失敗しました")
+    return {"status": "success", "message": "研究者をプロジェクトに追加しました"}
 
 @app.delete("/api/temp-projects/{project_id}/researchers/{researcher_name}")
 async def remove_researcher_from_project(project_id: str, researcher_name: str):
     """プロジェクトから研究者を削除"""
-    try:
-        success = project_manager.remove_researcher_from_project(project_id, researcher_name)
-        if not success:
-            raise HTTPException(status_code=404, detail="研究者が見つかりません")
-        return {"status": "success", "message": "研究者をプロジェクトから削除しました"}
-    except Exception as e:
-        logger.error(f"❌ 研究者削除エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = project_manager.remove_researcher_from_project(project_id, researcher_name)
+    if not success:
+        raise HTTPException(status_code=404, detail="研究者が見つかりません")
+    return {"status": "success", "message": "研究者をプロジェクトから削除しました"}
 
 @app.post("/api/temp-projects/{project_id}/matching-request")
-async def submit_matching_request(project_id: str, request: MatchingRequest):
+async def submit_matching_request(project_id: str, request: MatchingRequest, background_tasks: BackgroundTasks):
     """マッチング依頼を送信"""
-    try:
-        result = project_manager.submit_matching_request(project_id, request)
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return {"status": "success", "result": result}
-    except Exception as e:
-        logger.error(f"❌ マッチング依頼エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = project_manager.submit_matching_request(project_id, request)
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    # 依頼の受付までを応答し、外部への送信は応答後にバックグラウンドで行う
+    background_tasks.add_task(project_manager.dispatch_matching_request, result["matching_id"])
+    return {"status": "success", "result": result}
+
+@app.get("/api/matching-requests/{matching_id}")
+async def get_matching_request_status(matching_id: str):
+    """マッチング依頼の送信状況を取得"""
+    matching_data = project_manager.get_matching_request(matching_id)
+    if not matching_data:
+        raise HTTPException(status_code=404, detail="マッチング依頼が見つかりません")
+    return {
+        "status": "success",
+        "matching_id": matching_id,
+        "project_id": matching_data["project_id"],
+        "request_status": matching_data["status"],
+        "progress": matching_data["progress"],
+        "submitted_at": matching_data["submitted_at"],
+        "updated_at": matching_data["updated_at"],
+        "sent_at": matching_data.get("sent_at")
+    }
 
 @app.put("/api/temp-projects/{project_id}/status")
-async def update_project_status(project_id: str, status: str = Query(...)):
-    """プロジェクトステータスを更新"""
-    try:
-        success = project_manager.update_project_status(project_id, status)
-        if not success:
-            raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
-        return {"status": "success", "message": f"ステータスを{status}に更新しました"}
-    except Exception as e:
-        logger.error(f"❌ ステータス更新エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def update_project_status(project_id: str, body: ProjectStatusUpdate):
+    """プロジェクトステータスを更新（不正なステータスはリクエスト検証の段階で422になる）"""
+    success = project_manager.update_project_status(project_id, body.status)
+    if not success:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    return {"status": "success", "message": f"ステータスを{body.status}に更新しました"}
 
 @app.put("/api/temp-projects/{project_id}/researchers/{researcher_name}/memo")
-async def update_researcher_memo(project_id: str, researcher_name: str, memo: str = Query(...)):
+async def update_researcher_memo(project_id: str, researcher_name: str, body: ResearcherMemoBody):
     """研究者のメモを更新"""
-    try:
-        success = project_manager.update_researcher_memo(project_id, researcher_name, memo)
-        if not success:
-            raise HTTPException(status_code=404, detail="研究者またはプロジェクトが見つかりません")
-        return {"status": "success", "message": "メモを更新しました"}
-    except Exception as e:
-        logger.error(f"❌ 研究者メモ更新エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = project_manager.update_researcher_memo(project_id, researcher_name, body.memo)
+    if not success:
+        raise HTTPException(status_code=404, detail="研究者またはプロジェクトが見つかりません")
+    return {"status": "success", "message": "メモを更新しました"}
+
+@app.patch("/api/temp-projects/{project_id}/researchers/memos")
+async def bulk_update_researcher_memos(project_id: str, memos: Dict[str, str]):
+    """複数研究者のメモを一括更新（研究者名 → メモ）"""
+    not_found = project_manager.bulk_update_researcher_memos(project_id, memos)
+    if not_found is None:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    return {
+        "status": "success",
+        "message": "メモを更新しました",
+        "updated": len(memos) - len(not_found),
+        "not_found": not_found
+    }
 
 @app.delete("/api/temp-projects/{project_id}")
 async def delete_temp_project(project_id: str):
     """仮プロジェクトを削除"""
-    try:
-        success = project_manager.delete_temp_project(project_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
-        return {"status": "success", "message": "プロジェクトを削除しました"}
-    except Exception as e:
-        logger.error(f"❌ プロジェクト削除エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = project_manager.delete_temp_project(project_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="プロジェクトが見つかりません")
+    return {"status": "success", "message": "プロジェクトを削除しました"}
 
 # エラーハンドラー
+# エラー時のレスポンス本文は固定のため、起動時に一度だけシリアライズしておく
+_GOOGLE_API_ERROR_BODY = orjson.dumps({"detail": "外部サービス（Google Cloud）でエラーが発生しました"})
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "内部サーバーエラー"})
+
+if GOOGLE_API_CORE_AVAILABLE:
+    @app.exception_handler(GoogleAPIError)
+    async def google_api_exception_handler(request, exc):
+        logger.error("Google Cloud APIエラー: %s", exc, exc_info=exc)
+        return Response(content=_GOOGLE_API_ERROR_BODY, status_code=503, media_type="application/json")
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request, exc):
+    # 既定のハンドラは標準jsonのJSONResponseを使うため、404などのエラー応答もorjsonで返す
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request, exc):
+    # 既定のハンドラと同じ本文を、標準jsonではなくorjsonで返す
+    return ORJSONResponse({"detail": jsonable_encoder(exc.errors())}, status_code=422)
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    logger.error(f"予期しないエラー: {exc}")
-    import traceback
-    logger.error(traceback.format_exc())
-    return JSONResponse(
-        status_code=500,
-        content={"detail": f"内部サーバーエラー: {str(exc)}"}
-    )
+    # 各エンドポイントでは個別に捕捉せず、想定外の例外はここで記録して500を返す
+    logger.error("予期しないエラー: %s %s - %s", request.method, request.url.path, exc, exc_info=exc)
+    return Response(content=_INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
     
     port = int(os.environ.get("PORT", 8000))
+    # 仮プロジェクトはプロセス内メモリに保持しているため、既定は1ワーカー
+    # （外部ストレージ化した環境では WEB_CONCURRENCY で増やせる）
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
     print(f"🚀 Starting Research API v2.1.1 (最終修正版) on port {port}")
     
+    # uvloop は Windows では利用できないため、インストールされている場合のみ使用する
+    try:
+        import uvloop  # noqa: F401
+        UVLOOP_AVAILABLE = True
+    except ImportError:
+        UVLOOP_AVAILABLE = False
+    
+    # httptools も未インストールの環境（依存関係の導入前のローカル起動など）では h11 で起動する
+    try:
+        import httptools  # noqa: F401
+        HTTPTOOLS_AVAILABLE = True
+    except ImportError:
+        HTTPTOOLS_AVAILABLE = False
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
         reload=False,
+        workers=workers,
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        # リクエストごとのアクセスログ出力は負荷が大きいため無効化（各エンドポイントで必要なログは出力済み）
+        access_log=False,
         log_level="info"
     )
@@ -3,17 +3,23 @@
 仮プロジェクト作成、研究者選択、マッチング依頼の管理
 """
 
+import asyncio
 import logging
+import os
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional, Any
+from pydantic import BaseModel, ConfigDict
+from cachetools import TTLCache
 from google.cloud import bigquery
 import json
 
 logger = logging.getLogger(__name__)
 
+# プロジェクトの状態（モデルの注釈で参照するため、各モデルより先に定義する）
+ProjectStatus = Literal["draft", "active", "matching_requested", "completed"]
+
 class TempProject(BaseModel):
     """仮プロジェクトデータモデル"""
     id: str
@@ -23,7 +29,7 @@ class TempProject(BaseModel):
     duration: Optional[int] = None
     requirements: Optional[str] = None
     keywords: Optional[str] = None
-    status: str = "draft"  # draft, active, matching_requested, completed
+    status: ProjectStatus = "draft"
     created_at: str
     updated_at: Optional[str] = None
     user_id: Optional[str] = None
@@ -49,23 +55,55 @@ class ResearcherSelectionRequest(BaseModel):
 
 class MatchingRequest(BaseModel):
     """マッチング依頼リクエスト"""
+    # FastAPIで検証済みのモデルをそのまま受け渡すため、不変にして再構築・複製を不要にする
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     project_id: str
     message: str
     priority: str = "normal"  # normal, high, urgent
     request_to_consultant: bool = False  # 専門コンサルタントへの依頼フラグ
     consultant_requirements: Optional[str] = None  # コンサルタント要件
 
+class ProjectStatusUpdate(BaseModel):
+    """プロジェクトステータス更新リクエスト"""
+    status: ProjectStatus
+
+class ResearcherMemoBody(BaseModel):
+    """研究者メモ更新リクエスト（対象はパスで指定）"""
+    memo: str
+
 class ResearcherMemoUpdate(BaseModel):
     """研究者メモ更新リクエスト"""
     project_id: str
     researcher_name: str
     memo: str
 
+# 送信処理中とみなすマッチング依頼の状態と、進捗が途絶えたと判断するまでの時間（秒）
+# （同時送信数の上限待ちの "queued" は進捗が無くても失敗扱いにしない）
+MATCHING_ACTIVE_STATUSES = ("submitted", "sending")
+MATCHING_HEARTBEAT_TIMEOUT_SECONDS = 60
+
+# 保持するマッチング依頼の上限件数と保持期間（秒）
+MATCHING_REQUESTS_MAX_ENTRIES = 1000
+MATCHING_REQUESTS_TTL_SECONDS = 24 * 60 * 60
+
+# 外部システムへのマッチング依頼の同時送信数
+MATCHING_DISPATCH_CONCURRENCY = int(os.getenv("MATCH_CONCURRENCY", "4"))
+
 class ProjectManager:
     """プロジェクト管理クラス"""
     
     def __init__(self):
         self.projects_storage = {}  # メモリ内ストレージ（本番環境では外部DB使用）
+        self.version = 0  # 変更のたびに増える版番号（一覧応答のキャッシュ判定に使用）
+        # マッチング依頼（matching_id → 依頼内容と送信状況）。件数と保持期間を制限して溜め込まない
+        self.matching_requests = TTLCache(maxsize=MATCHING_REQUESTS_MAX_ENTRIES, ttl=MATCHING_REQUESTS_TTL_SECONDS)
+        self._dispatch_semaphore = asyncio.Semaphore(MATCHING_DISPATCH_CONCURRENCY)
+        self._dispatching = set()  # 送信処理が実行中のマッチング依頼ID
+    
+    def _mark_modified(self) -> None:
+        """プロジェクトデータの変更を記録"""
+        self.version += 1
         
     def create_temp_project(self, request: ProjectCreateRequest) -> TempProject:
         """仮プロジェクトを作成"""
@@ -85,7 +123,8 @@ class ProjectManager:
         )
         
         self.projects_storage[project_id] = project
-        logger.info(f"✅ 仮プロジェクト作成: {project_id} - {request.name}")
+        self._mark_modified()
+        logger.info("✅ 仮プロジェクト作成: %s - %s", project_id, request.name)
         
         return project
     
@@ -105,10 +144,24 @@ class ProjectManager:
         
         return projects
     
+    def list_temp_projects_summary(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """一覧表示用に必要な項目だけを射影した仮プロジェクト一覧を取得"""
+        return [
+            {
+                "id": project.id,
+                "name": project.name,
+                "status": project.status,
+                "researcher_count": len(project.selected_researchers),
+                "created_at": project.created_at,
+                "updated_at": project.updated_at
+            }
+            for project in self.list_temp_projects(user_id)
+        ]
+    
     def add_researcher_to_project(
         self, 
         project_id: str, 
-        researcher: Dict[str, Any]
+        researcher: ResearcherSelectionRequest
     ) -> bool:
         """プロジェクトに研究者を追加"""
         project = self.get_temp_project(project_id)
@@ -117,24 +170,25 @@ class ProjectManager:
         
         # 重複チェック
         for existing_researcher in project.selected_researchers:
-            if existing_researcher.get("name") == researcher.get("name"):
-                logger.warning(f"研究者は既に追加済み: {researcher.get('name')}")
+            if existing_researcher.get("name") == researcher.researcher_name:
+                logger.warning("研究者は既に追加済み: %s", researcher.researcher_name)
                 return False
         
-        # 研究者情報を追加
+        # 研究者情報を追加（検証済みのリクエストモデルから必要な項目だけを読み取る）
         researcher_data = {
-            "name": researcher.get("name", ""),
-            "affiliation": researcher.get("affiliation", ""),
-            "researchmap_url": researcher.get("researchmap_url", ""),
-            "selection_reason": researcher.get("selection_reason", ""),
-            "memo": researcher.get("memo", ""),  # メモフィールドを追加
+            "name": researcher.researcher_name,
+            "affiliation": researcher.researcher_affiliation,
+            "researchmap_url": researcher.researchmap_url or "",
+            "selection_reason": researcher.selection_reason or "",
+            "memo": "",  # メモフィールドを追加
             "added_at": datetime.now().isoformat()
         }
         
         project.selected_researchers.append(researcher_data)
         project.updated_at = datetime.now().isoformat()
+        self._mark_modified()
         
-        logger.info(f"✅ 研究者追加: {project_id} に {researcher.get('name')} を追加")
+        logger.info("✅ 研究者追加: %s に %s を追加", project_id, researcher.researcher_name)
         
         return True
     
@@ -153,7 +207,8 @@ class ProjectManager:
             if researcher.get("name") == researcher_name:
                 project.selected_researchers.pop(i)
                 project.updated_at = datetime.now().isoformat()
-                logger.info(f"✅ 研究者削除: {project_id} から {researcher_name} を削除")
+                self._mark_modified()
+                logger.info("✅ 研究者削除: %s から %s を削除", project_id, researcher_name)
                 return True
         
         return False
@@ -175,11 +230,41 @@ class ProjectManager:
                 researcher["memo"] = memo
                 researcher["memo_updated_at"] = datetime.now().isoformat()
                 project.updated_at = datetime.now().isoformat()
-                logger.info(f"📝 研究者メモ更新: {project_id} - {researcher_name}")
+                self._mark_modified()
+                logger.info("📝 研究者メモ更新: %s - %s", project_id, researcher_name)
                 return True
         
         return False
     
+    def bulk_update_researcher_memos(
+        self, 
+        project_id: str, 
+        memos: Dict[str, str]
+    ) -> Optional[List[str]]:
+        """複数研究者のメモを一括更新（プロジェクトが無い場合はNone、見つからなかった研究者名のリストを返す）"""
+        project = self.get_temp_project(project_id)
+        if not project:
+            return None
+        
+        # 研究者名で一度だけ索引を作り、まとめて更新する
+        researchers_by_name = {researcher.get("name"): researcher for researcher in project.selected_researchers}
+        now = datetime.now().isoformat()
+        not_found = []
+        for researcher_name, memo in memos.items():
+            researcher = researchers_by_name.get(researcher_name)
+            if researcher is None:
+                not_found.append(researcher_name)
+                continue
+            researcher["memo"] = memo
+            researcher["memo_updated_at"] = now
+        
+        if len(not_found) < len(memos):
+            project.updated_at = now
+            self._mark_modified()
+        logger.info("📝 研究者メモ一括更新: %s - %s名", project_id, len(memos) - len(not_found))
+        
+        return not_found
+    
     def submit_matching_request(
         self, 
         project_id: str, 
@@ -196,30 +281,26 @@ class ProjectManager:
         # プロジェクトステータスを更新
         project.status = "matching_requested"
         project.updated_at = datetime.now().isoformat()
+        self._mark_modified()
+        
+        matching_id = f"MATCH_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
         
-        # マッチング依頼情報を保存
-        matching_data = {
+        # マッチング依頼情報を保存（外部システムへの送信は dispatch_matching_request で応答後に行う）
+        # 送信までに研究者の追加・削除があっても依頼内容が変わらないよう、選択中の研究者は複製して保持する
+        self.matching_requests[matching_id] = {
             "project_id": project_id,
             "message": request.message,
             "priority": request.priority,
             "request_to_consultant": request.request_to_consultant,
             "consultant_requirements": request.consultant_requirements if request.request_to_consultant else None,
-            "researchers": project.selected_researchers,
+            "researchers": [dict(r) for r in project.selected_researchers],
             "submitted_at": datetime.now().isoformat(),
-            "status": "submitted"
+            "status": "submitted",
+            "progress": 0,
+            "updated_at": datetime.now().isoformat(),
+            "heartbeat_at": time.monotonic()
         }
         
-        # 本番環境では外部システムに送信
-        if request.request_to_consultant:
-            logger.info(f"👨‍💼 専門コンサルタントへマッチング依頼送信: {project_id}")
-            logger.info(f"   コンサルタント要件: {request.consultant_requirements}")
-        else:
-            logger.info(f"📤 研究者へ直接マッチング依頼送信: {project_id}")
-            logger.info(f"   対象研究者: {len(project.selected_researchers)}名")
-        logger.info(f"   メッセージ: {request.message[:100]}...")
-        
-        matching_id = f"MATCH_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
         return {
             "success": True,
             "matching_id": matching_id,
@@ -229,10 +310,73 @@ class ProjectManager:
             "consultant_requirements": request.consultant_requirements if request.request_to_consultant else None
         }
     
+    def get_matching_request(self, matching_id: str) -> Optional[Dict[str, Any]]:
+        """
+        マッチング依頼を取得
+        送信処理が動いていないのに一定時間進捗の無い依頼は失敗扱いにする（送信中の依頼は送信の完了を待つ）
+        """
+        matching_data = self.matching_requests.get(matching_id)
+        if (
+            matching_data
+            and matching_id not in self._dispatching
+            and matching_data["status"] in MATCHING_ACTIVE_STATUSES
+            and time.monotonic() - matching_data["heartbeat_at"] > MATCHING_HEARTBEAT_TIMEOUT_SECONDS
+        ):
+            logger.warning("⚠️ マッチング依頼の進捗が途絶えたため失敗扱いにします: %s", matching_id)
+            self._update_matching_status(matching_data, "failed", matching_data["progress"])
+        return matching_data
+    
+    def _update_matching_status(self, matching_data: Dict[str, Any], status: str, progress: int) -> None:
+        """マッチング依頼の状態・進捗を更新し、ハートビートを記録"""
+        matching_data["status"] = status
+        matching_data["progress"] = progress
+        matching_data["updated_at"] = datetime.now().isoformat()
+        matching_data["heartbeat_at"] = time.monotonic()
+    
+    async def dispatch_matching_request(self, matching_id: str) -> None:
+        """保存済みのマッチング依頼を送信（応答を返した後にバックグラウンドで実行）"""
+        matching_data = self.get_matching_request(matching_id)
+        if not matching_data:
+            logger.warning("送信対象のマッチング依頼が見つかりません: %s", matching_id)
+            return
+        
+        if matching_data["status"] not in MATCHING_ACTIVE_STATUSES:
+            # 進捗途絶で失敗扱いになった依頼などは送信し直さない
+            logger.warning("送信対象外の状態のマッチング依頼です: %s (%s)", matching_id, matching_data["status"])
+            return
+        
+        project_id = matching_data["project_id"]
+        self._dispatching.add(matching_id)
+        try:
+            self._update_matching_status(matching_data, "queued", 25)
+            
+            # 送信先への同時依頼数を制限し、依頼が集中しても送信先に負荷が集中しないようにする
+            async with self._dispatch_semaphore:
+                self._update_matching_status(matching_data, "sending", 50)
+                
+                try:
+                    # 本番環境では外部システムに送信
+                    if matching_data["request_to_consultant"]:
+                        logger.info("👨‍💼 専門コンサルタントへマッチング依頼送信: %s", project_id)
+                        logger.info("   コンサルタント要件: %s", matching_data['consultant_requirements'])
+                    else:
+                        logger.info("📤 研究者へ直接マッチング依頼送信: %s", project_id)
+                        logger.info("   対象研究者: %s名", len(matching_data['researchers']))
+                    logger.info("   メッセージ: %s...", matching_data['message'][:100])
+                except Exception as e:
+                    logger.error("❌ マッチング依頼送信エラー: %s - %s", matching_id, e, exc_info=True)
+                    self._update_matching_status(matching_data, "failed", matching_data["progress"])
+                    return
+                
+                self._update_matching_status(matching_data, "sent", 100)
+            matching_data["sent_at"] = matching_data["updated_at"]
+        finally:
+            self._dispatching.discard(matching_id)
+    
     def update_project_status(
         self, 
         project_id: str, 
-        status: str
+        status: ProjectStatus
     ) -> bool:
         """プロジェクトステータスを更新"""
         project = self.get_temp_project(project_id)
@@ -241,8 +385,9 @@ class ProjectManager:
         
         project.status = status
         project.updated_at = datetime.now().isoformat()
+        self._mark_modified()
         
-        logger.info(f"🔄 プロジェクトステータス更新: {project_id} -> {status}")
+        logger.info("🔄 プロジェクトステータス更新: %s -> %s", project_id, status)
         
         return True
     
@@ -251,7 +396,11 @@ class ProjectManager:
         if project_id in self.projects_storage:
             project = self.projects_storage[project_id]
             del self.projects_storage[project_id]
-            logger.info(f"🗑️ 仮プロジェクト削除: {project_id} - {project.name}")
+            # 削除したプロジェクトのマッチング依頼も破棄する（送信中の依頼は送信処理側が参照を保持している）
+            for matching_id in [mid for mid, data in self.matching_requests.items() if data["project_id"] == project_id]:
+                self.matching_requests.pop(matching_id, None)
+            self._mark_modified()
+            logger.info("🗑️ 仮プロジェクト削除: %s - %s", project_id, project.name)
             return True
         return False
 
@@ -6,6 +6,7 @@ BigQuery + Vertex AI + 評価システムを使用した本格的な検索シス
 import logging
 import time
 import re
+import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from google.cloud import bigquery
@@ -13,19 +14,41 @@ from vertexai.language_models import TextEmbeddingModel
 from vertexai.generative_models import GenerativeModel
 import numpy as np
 from evaluation_system import UniversalResearchEvaluator
+from gcp_auth import get_bqstorage_client
 
 logger = logging.getLogger(__name__)
 
 # 評価システムのインスタンスをグローバルに保持
 evaluator = UniversalResearchEvaluator()
 
+# LLM要約生成の同時実行数（APIレート制限対策）
+LLM_SUMMARY_CONCURRENCY = 8
+
+# LLM要約を生成できなかった場合に代わりに入れる文言
+SUMMARY_RATE_LIMITED_MESSAGE = "⚠️ API制限のため要約をスキップしました"
+
+def fallback_summary(query: str) -> str:
+    """LLM要約の代わりに入れる定型文"""
+    return f"「{query}」に関連する研究を行っています。"
+
+def fetch_rows(bq_client: bigquery.Client, sql: str, job_config: Optional[bigquery.QueryJobConfig] = None) -> List[Dict[str, Any]]:
+    """
+    クエリ結果をArrow経由で辞書のリストとして取得する。
+    Storage Read APIクライアントがあれば大きな結果セットはそちらで取得し、行ごとのRow生成を避ける。
+    """
+    arrow_table = bq_client.query(sql, job_config=job_config).result().to_arrow(
+        bqstorage_client=get_bqstorage_client(),
+        create_bqstorage_client=False
+    )
+    return arrow_table.to_pylist()
+
 def is_young_researcher(researcher_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
     若手研究者かどうかを判定するロジック（インデント修正・文字化け対策版）
     """
     reasons = []
     name = researcher_data.get('name_ja', 'Unknown')
-    logger.debug(f"🔍 若手研究者判定開始: {name}")
+    logger.debug("🔍 若手研究者判定開始: %s", name)
 
     # --- データ準備 ---
     profile_ja = (researcher_data.get('profile_ja', '') or '').lower()
@@ -46,20 +69,20 @@ def is_young_researcher(researcher_data: Dict[str, Any]) -> Tuple[bool, List[str
     for pos in senior_positions_ja:
         if pos in combined_job_info:
             reasons = [f"除外条件(\u8077\u4f4d): {pos}"]
-            logger.debug(f"🎯 若手判定結果: {name} - False - {reasons}")
+            logger.debug("🎯 若手判定結果: %s - False - %s", name, reasons)
             return False, reasons
             
     for pos in senior_positions_en:
         if pos in combined_job_info and 'associate professor' not in combined_job_info:
             reasons = [f"除外条件(\u8077\u4f4d,英): {pos}"]
-            logger.debug(f"🎯 若手判定結果: {name} - False - {reasons}")
+            logger.debug("🎯 若手判定結果: %s - False - %s", name, reasons)
             return False, reasons
 
     exclusion_keywords_profile = ['退職', '元教授', '元所長', '顧問', '理事長', '学長', '総長']
     for keyword in exclusion_keywords_profile:
         if keyword in profile_ja:
             reasons = [f"除外条件(経歴): {keyword}"]
-            logger.debug(f"🎯 若手判定結果: {name} - False - {reasons}")
+            logger.debug("🎯 若手判定結果: %s - False - %s", name, reasons)
             return False, reasons
 
     # --- 2. 若手判定 (職位を優先) ---
@@ -125,7 +148,7 @@ def is_young_researcher(researcher_data: Dict[str, Any]) -> Tuple[bool, List[str
                         break
 
     is_young = len(reasons) > 0
-    logger.debug(f"🎯 若手判定結果: {name} - {is_young} - {reasons}")
+    logger.debug("🎯 若手判定結果: %s - %s - %s", name, is_young, reasons)
     return is_young, list(set(reasons))
 
 
@@ -133,30 +156,35 @@ async def perform_real_search(request) -> Dict[str, Any]:
     """
     研究者検索のメイン関数（フィルタリングロジック修正版）
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        logger.info(f"🔍 実際の検索開始: {request.query}, method: {request.method}")
+        logger.info("🔍 実際の検索開始: %s, method: %s", request.query, request.method)
         
         # --- パラメータ準備 ---
         young_researcher_filter = getattr(request, 'young_researcher_filter', False)
         university_filter = getattr(request, 'university_filter', None)
         exclude_keywords = getattr(request, 'exclude_keywords', None)
         
-        logger.info(f"📊 若手フィルター: {'ON' if young_researcher_filter else 'OFF'}")
-        if university_filter: logger.info(f"🏫 大学フィルター: {university_filter}")
-        if exclude_keywords: logger.info(f"🚫 除外キーワード: {exclude_keywords}")
+        logger.info("📊 若手フィルター: %s", 'ON' if young_researcher_filter else 'OFF')
+        if university_filter: logger.info("🏫 大学フィルター: %s", university_filter)
+        if exclude_keywords: logger.info("🚫 除外キーワード: %s", exclude_keywords)
 
         # --- GCPクライアント準備 ---
         from gcp_auth import get_bigquery_client, is_vertex_ai_ready
-        bq_client = get_bigquery_client()
+        # 未初期化の場合はここでGCP初期化が走るため、イベントループを塞がないようスレッドで実行
+        bq_client = await asyncio.to_thread(get_bigquery_client)
         if not bq_client:
             raise Exception("BigQueryクライアントが利用できません")
         
+        # 要求どおりに実行できなかった（フォールバックした）結果かどうか。呼び出し側はこの結果をキャッシュしない
+        degraded = False
+        
         vertex_ai_available = is_vertex_ai_ready()
         if (request.method == "semantic" or request.use_llm_expansion) and not vertex_ai_available:
             logger.warning("⚠️ Vertex AIが利用できないため、キーワード検索にフォールバックします。")
             request.method = "keyword"
             request.use_llm_expansion = False
+            degraded = True
 
         # --- クエリ拡張 (必要な場合) ---
         search_query = request.query.strip()
@@ -167,40 +195,52 @@ async def perform_real_search(request) -> Dict[str, Any]:
                 if expansion_result and expansion_result["expanded_keywords"] != [search_query]:
                     expanded_info = expansion_result
                     search_query = expansion_result["expanded_query"]
-                    logger.info(f"🧠 クエリ拡張実行: {search_query}")
+                    logger.info("🧠 クエリ拡張実行: %s", search_query)
             except Exception as e:
-                logger.warning(f"⚠️ LLMクエリ拡張失敗: {e}")
+                logger.warning("⚠️ LLMクエリ拡張失敗: %s", e)
 
         # --- 検索実行 ---
         # 各検索関数内で is_young_researcher の判定が行われる
         if request.method == "semantic":
-            results = await semantic_search_with_embedding(bq_client, search_query, request.max_results, university_filter, exclude_keywords)
+            try:
+                results = await semantic_search_with_embedding(bq_client, search_query, request.max_results, university_filter, exclude_keywords)
+            except Exception as e:
+                logger.error("❌ セマンティック検索エラー: %s", e)
+                logger.info("🔄 キーワード検索にフォールバック")
+                request.method = "keyword"
+                degraded = True
+                results = await keyword_search(bq_client, search_query, request.max_results, university_filter, exclude_keywords)
         else:
             results = await keyword_search(bq_client, search_query, request.max_results, university_filter, exclude_keywords)
         
-        logger.info(f"📊 初期検索結果: {len(results)}件")
+        logger.info("📊 初期検索結果: %s件", len(results))
 
         # --- 若手研究者フィルタリング (ここが重要) ---
         # 検索結果に対して、リクエストに応じてフィルタリングを適用する
         if young_researcher_filter:
-            logger.info(f"🌟 若手研究者フィルタリングを実行")
+            logger.info("🌟 若手研究者フィルタリングを実行")
             
             # is_young_researcherがTrueのレコードのみを抽出
             filtered_results = [r for r in results if r.get('is_young_researcher', False)]
             
-            logger.info(f"🌟 フィルタリング結果: {len(results)}件 → {len(filtered_results)}件")
+            logger.info("🌟 フィルタリング結果: %s件 → %s件", len(results), len(filtered_results))
             results = filtered_results
 
         # --- AI要約 (フィルタリング後の結果に対して実行) ---
-        if request.use_llm_summary and results and vertex_ai_available:
-            try:
-                results = await add_llm_summaries(results, request.query)
-                logger.info("🤖 AI要約を追加完了")
-            except Exception as e:
-                logger.warning(f"⚠️ AI要約生成失敗: {e}")
+        if request.use_llm_summary and results:
+            if vertex_ai_available:
+                try:
+                    results = await add_llm_summaries(results, request.query)
+                    logger.info("🤖 AI要約を追加完了")
+                except Exception as e:
+                    logger.warning("⚠️ AI要約生成失敗: %s", e)
+            # 要約が欠けている・定型文で代替された結果が含まれていれば、要求どおりの結果ではない
+            placeholders = (SUMMARY_RATE_LIMITED_MESSAGE, fallback_summary(request.query))
+            if any(not r.get("llm_summary") or r["llm_summary"] in placeholders for r in results):
+                degraded = True
 
         # --- レスポンス生成 ---
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         executed_query_info = f"実際のGCP検索実行 (方法: {request.method}, 実行時間: {execution_time:.2f}秒)"
         
         return {
@@ -211,17 +251,16 @@ async def perform_real_search(request) -> Dict[str, Any]:
             "total": len(results),
             "execution_time": execution_time,
             "executed_query_info": executed_query_info,
-            "expanded_info": expanded_info
+            "expanded_info": expanded_info,
+            "degraded": degraded
         }
 
     except Exception as e:
-        logger.error(f"❌ 実際の検索でエラー: {e}")
-        import traceback
-        logger.error(f"スタックトレース: {traceback.format_exc()}")
+        logger.error("❌ 実際の検索でエラー: %s", e, exc_info=True)
         return {
             "status": "error",
             "error_message": str(e),
-            "execution_time": time.time() - start_time
+            "execution_time": time.perf_counter() - start_time
         }
 
 # ▼▼▼ この関数をまるごと置き換えてください ▼▼▼
@@ -231,7 +270,7 @@ async def semantic_search_with_embedding(bq_client: bigquery.Client, query: str,
     """
     query_embedding = None
     try:
-        logger.info(f"🔍 セマンティック検索（事後フィルタリング【修正版】）実行: {query}")
+        logger.info("🔍 セマンティック検索（事後フィルタリング【修正版】）実行: %s", query)
         
         # 1. クエリのベクトル化
         embedding_model = TextEmbeddingModel.from_pretrained("text-multilingual-embedding-002")
@@ -257,7 +296,7 @@ async def semantic_search_with_embedding(bq_client: bigquery.Client, query: str,
                 normalization_sql = get_university_normalization_sql("main_affiliation_name_ja")
                 university_condition = f" AND ({normalization_sql}) IN ({university_list})"
             except Exception as e:
-                logger.warning(f"⚠️ 大学正規化システムエラー、シンプルフィルターを使用: {e}")
+                logger.warning("⚠️ 大学正規化システムエラー、シンプルフィルターを使用: %s", e)
                 safe_universities = [univ.replace("'", "''") for univ in university_filter]
                 like_conditions = [f"main_affiliation_name_ja LIKE '%{univ}%'" for univ in safe_universities]
                 university_condition = f" AND ({' OR '.join(like_conditions)})"
@@ -304,7 +343,7 @@ async def semantic_search_with_embedding(bq_client: bigquery.Client, query: str,
         LIMIT @max_results
         """
         
-        logger.info(f"Generated SQL for Semantic Search:\n{sql_query_semantic}")
+        logger.info("Generated SQL for Semantic Search:\n%s", sql_query_semantic)
         
         try:
             job_config = bigquery.QueryJobConfig(
@@ -313,41 +352,37 @@ async def semantic_search_with_embedding(bq_client: bigquery.Client, query: str,
                     bigquery.ScalarQueryParameter("max_results", "INT64", max_results),
                 ]
             )
-            df = bq_client.query(sql_query_semantic, job_config=job_config).to_dataframe()
+            rows = fetch_rows(bq_client, sql_query_semantic, job_config)
             
-            if len(df) > 0:
+            if len(rows) > 0:
                 results = []
-                # この修正により、dfには既に展開されたカラムが含まれるため、整形ロジックを簡略化
-                for idx, row in df.iterrows():
-                    result = row.to_dict()
-                    result["distance"] = row["distance"] # ← この行を追加
+                # 各行には既に展開されたカラム（distanceを含む）が含まれるため、そのまま結果として使う
+                for result in rows:
                     is_young, young_reasons = is_young_researcher(result)
                     result["is_young_researcher"] = is_young
                     result["young_researcher_reasons"] = young_reasons
                     results.append(result)
                 
-                logger.info(f"✅ セマンティック検索完了: {len(results)}件")
+                logger.info("✅ セマンティック検索完了: %s件", len(results))
                 return results
             else:
                 logger.info("検索結果が空です。")
                 return []
                 
         except Exception as e:
-            logger.error(f"BigQueryセマンティック検索中にエラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("BigQueryセマンティック検索中にエラーが発生しました: %s", e, exc_info=True)
             logger.info("🔄 リアルタイムベクトル化検索にフォールバック")
             return await semantic_search_realtime_fallback(bq_client, query, query_embedding, max_results, university_filter, exclude_keywords)
         
     except Exception as e:
-        logger.error(f"❌ セマンティック検索エラー: {e}")
-        logger.info("🔄 キーワード検索にフォールバック")
-        return await keyword_search(bq_client, query, max_results, university_filter, exclude_keywords)
+        # キーワード検索へのフォールバックは呼び出し側（perform_real_search）で行う
+        logger.error("❌ セマンティック検索エラー: %s", e)
+        raise
 
 async def semantic_search_realtime_fallback(bq_client: bigquery.Client, query: str, query_embedding: List[float], max_results: int, university_filter: Optional[List[str]] = None, exclude_keywords: Optional[List[str]] = None) -> List[Dict]:
     # (この関数は変更ありません)
     try:
-        logger.info(f"🔍 リアルタイムベクトル化セマンティック検索実行")
+        logger.info("🔍 リアルタイムベクトル化セマンティック検索実行")
         first_keyword = query.split()[0] if query.split() else query
         university_condition = ""
         if university_filter and len(university_filter) > 0:
@@ -358,7 +393,7 @@ async def semantic_search_realtime_fallback(bq_client: bigquery.Client, query: s
                 normalization_sql = get_university_normalization_sql("main_affiliation_name_ja")
                 university_condition = f" AND ({normalization_sql}) IN ({university_list})"
             except Exception as e:
-                logger.warning(f"⚠️ 大学正規化システムエラー、シンプルフィルターを使用: {e}")
+                logger.warning("⚠️ 大学正規化システムエラー、シンプルフィルターを使用: %s", e)
                 safe_universities = [univ.replace("'", "''") for univ in university_filter]
                 like_conditions = [f"main_affiliation_name_ja LIKE '%{univ}%'" for univ in safe_universities]
                 university_condition = f" AND ({' OR '.join(like_conditions)})"
@@ -370,18 +405,18 @@ async def semantic_search_realtime_fallback(bq_client: bigquery.Client, query: s
                 conditions.append(f""" NOT ( LOWER(research_keywords_ja) LIKE LOWER('%{safe_keyword}%') OR LOWER(research_fields_ja) LIKE LOWER('%{safe_keyword}%') OR LOWER(profile_ja) LIKE LOWER('%{safe_keyword}%') ) """)
             if conditions: exclude_condition = f" AND {' AND '.join(conditions)}"
         search_sql = f""" SELECT name_ja, name_en, main_affiliation_name_ja, main_affiliation_name_en, main_affiliation_job_ja, main_affiliation_job_title_ja, main_affiliation_job_en, main_affiliation_job_title_en, research_keywords_ja, research_fields_ja, profile_ja, paper_title_ja_first, project_title_ja_first, researchmap_url FROM `apt-rope-217206.researcher_data.rd_250524` WHERE ( research_keywords_ja IS NOT NULL OR research_fields_ja IS NOT NULL OR profile_ja IS NOT NULL ) AND ( LOWER(research_keywords_ja) LIKE LOWER('%{first_keyword}%') OR LOWER(research_fields_ja) LIKE LOWER('%{first_keyword}%') OR LOWER(profile_ja) LIKE LOWER('%{first_keyword}%') ){university_condition}{exclude_condition} LIMIT {max_results * 5} """
-        query_job = bq_client.query(search_sql)
         candidates = []
-        for row in query_job:
+        # SELECT句のカラムがそのまま研究者データの各フィールドになる
+        for row in fetch_rows(bq_client, search_sql):
             researcher_text = ""
-            if row.research_keywords_ja: researcher_text += row.research_keywords_ja + " "
-            if row.research_fields_ja: researcher_text += row.research_fields_ja + " "
-            if row.profile_ja: researcher_text += row.profile_ja[:200] + " "
-            candidates.append({ "data": { "name_ja": row.name_ja, "name_en": row.name_en, "main_affiliation_name_ja": row.main_affiliation_name_ja, "main_affiliation_name_en": row.main_affiliation_name_en, "main_affiliation_job_ja": row.main_affiliation_job_ja, "main_affiliation_job_title_ja": row.main_affiliation_job_title_ja, "main_affiliation_job_en": row.main_affiliation_job_en, "main_affiliation_job_title_en": row.main_affiliation_job_title_en, "research_keywords_ja": row.research_keywords_ja, "research_fields_ja": row.research_fields_ja, "profile_ja": row.profile_ja, "paper_title_ja_first": row.paper_title_ja_first, "project_title_ja_first": row.project_title_ja_first, "researchmap_url": row.researchmap_url }, "text": researcher_text.strip() })
+            if row["research_keywords_ja"]: researcher_text += row["research_keywords_ja"] + " "
+            if row["research_fields_ja"]: researcher_text += row["research_fields_ja"] + " "
+            if row["profile_ja"]: researcher_text += row["profile_ja"][:200] + " "
+            candidates.append({ "data": row, "text": researcher_text.strip() })
         if not candidates:
             logger.info("📊 セマンティック検索の候補が見つかりませんでした")
             return []
-        logger.info(f"📊 セマンティック検索候補: {len(candidates)}名")
+        logger.info("📊 セマンティック検索候補: %s名", len(candidates))
         embedding_model = TextEmbeddingModel.from_pretrained("text-multilingual-embedding-002")
         candidate_texts = [candidate["text"] for candidate in candidates if candidate["text"]]
         if not candidate_texts:
@@ -395,7 +430,7 @@ async def semantic_search_realtime_fallback(bq_client: bigquery.Client, query: s
                 batch_embeddings = embedding_model.get_embeddings(batch_texts)
                 candidate_embeddings.extend([emb.values for emb in batch_embeddings])
             except Exception as e:
-                logger.warning(f"⚠️ バッチ{i//batch_size + 1}のベクトル化失敗: {e}")
+                logger.warning("⚠️ バッチ%sのベクトル化失敗: %s", i//batch_size + 1, e)
                 candidate_embeddings.extend([[0.0] * len(query_embedding)] * len(batch_texts))
         results_with_similarity = []
         for i, candidate in enumerate(candidates[:len(candidate_embeddings)]):
@@ -411,11 +446,11 @@ async def semantic_search_realtime_fallback(bq_client: bigquery.Client, query: s
             results_with_similarity.append(result)
         results_with_similarity.sort(key=lambda x: x["distance"])
         final_results = results_with_similarity[:max_results]
-        logger.info(f"✅ リアルタイムセマンティック検索完了: {len(final_results)}件")
-        if final_results: logger.info(f"📊 最小距離: {final_results[0]['distance']:.4f}")
+        logger.info("✅ リアルタイムセマンティック検索完了: %s件", len(final_results))
+        if final_results: logger.info("📊 最小距離: %.4f", final_results[0]['distance'])
         return final_results
     except Exception as e:
-        logger.error(f"❌ リアルタイムセマンティック検索エラー: {e}")
+        logger.error("❌ リアルタイムセマンティック検索エラー: %s", e)
         raise
 
 def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -427,7 +462,7 @@ def calculate_cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         similarity = np.dot(vec1, vec2) / (norm1 * norm2)
         return float(similarity)
     except Exception as e:
-        logger.warning(f"⚠️ コサイン類似度計算エラー: {e}")
+        logger.warning("⚠️ コサイン類似度計算エラー: %s", e)
         return 0.0
 
 async def keyword_search(bq_client: bigquery.Client, query: str, max_results: int, university_filter: Optional[List[str]] = None, exclude_keywords: Optional[List[str]] = None) -> List[Dict]:
@@ -436,9 +471,9 @@ async def keyword_search(bq_client: bigquery.Client, query: str, max_results: in
     各キーワードのスコアをフィールド別に分解して返す。
     """
     try:
-        logger.info(f"🔍 キーワード検索実行: {query}")
+        logger.info("🔍 キーワード検索実行: %s", query)
         keywords = [kw.strip() for kw in query.split() if kw.strip()]
-        logger.info(f"📝 検索キーワード: {keywords}")
+        logger.info("📝 検索キーワード: %s", keywords)
 
         # --- WHERE句: いずれかのキーワードがいずれかのフィールドに含まれる ---
         like_conditions = []
@@ -498,7 +533,7 @@ async def keyword_search(bq_client: bigquery.Client, query: str, max_results: in
                 normalization_sql = get_university_normalization_sql("main_affiliation_name_ja")
                 university_condition = f" AND ({normalization_sql}) IN ({university_list})"
             except Exception as e:
-                logger.warning(f"⚠️ 大学正規化システムエラー、シンプルフィルターを使用: {e}")
+                logger.warning("⚠️ 大学正規化システムエラー、シンプルフィルターを使用: %s", e)
                 safe_universities = [univ.replace("'", "''") for univ in university_filter]
                 like_conds = [f"main_affiliation_name_ja LIKE '%{univ}%'" for univ in safe_universities]
                 university_condition = f" AND ({' OR '.join(like_conds)})"
@@ -540,36 +575,35 @@ async def keyword_search(bq_client: bigquery.Client, query: str, max_results: in
             LIMIT {max_results}
         """
 
-        logger.info(f"Generated SQL for Keyword Search (with contributions)")
-        query_job = bq_client.query(search_sql)
+        logger.info("Generated SQL for Keyword Search (with contributions)")
         results = []
 
-        for row in query_job:
+        for row in fetch_rows(bq_client, search_sql):
             researcher_data = {
-                "name_ja": row.name_ja,
-                "name_en": row.name_en,
-                "main_affiliation_name_ja": row.main_affiliation_name_ja,
-                "main_affiliation_name_en": row.main_affiliation_name_en,
-                "main_affiliation_job_ja": row.main_affiliation_job_ja,
-                "main_affiliation_job_title_ja": row.main_affiliation_job_title_ja,
-                "main_affiliation_job_en": row.main_affiliation_job_en,
-                "main_affiliation_job_title_en": row.main_affiliation_job_title_en,
-                "research_keywords_ja": row.research_keywords_ja,
-                "research_fields_ja": row.research_fields_ja,
-                "profile_ja": row.profile_ja,
-                "paper_title_ja_first": row.paper_title_ja_first,
-                "project_title_ja_first": row.project_title_ja_first,
-                "researchmap_url": row.researchmap_url,
-                "relevance_score": float(row.relevance_score) if row.relevance_score else None,
+                "name_ja": row["name_ja"],
+                "name_en": row["name_en"],
+                "main_affiliation_name_ja": row["main_affiliation_name_ja"],
+                "main_affiliation_name_en": row["main_affiliation_name_en"],
+                "main_affiliation_job_ja": row["main_affiliation_job_ja"],
+                "main_affiliation_job_title_ja": row["main_affiliation_job_title_ja"],
+                "main_affiliation_job_en": row["main_affiliation_job_en"],
+                "main_affiliation_job_title_en": row["main_affiliation_job_title_en"],
+                "research_keywords_ja": row["research_keywords_ja"],
+                "research_fields_ja": row["research_fields_ja"],
+                "profile_ja": row["profile_ja"],
+                "paper_title_ja_first": row["paper_title_ja_first"],
+                "project_title_ja_first": row["project_title_ja_first"],
+                "researchmap_url": row["researchmap_url"],
+                "relevance_score": float(row["relevance_score"]) if row["relevance_score"] else None,
             }
 
             # --- キーワード別寄与度の構築 ---
             keyword_contributions = []
             for i, keyword in enumerate(keywords):
-                kw_total = getattr(row, f"kw{i}_score", 0) or 0
+                kw_total = row.get(f"kw{i}_score", 0) or 0
                 field_scores = {}
                 for field_col, weight, field_label in field_definitions:
-                    score_val = getattr(row, f"kw{i}_{field_col}_score", 0) or 0
+                    score_val = row.get(f"kw{i}_{field_col}_score", 0) or 0
                     if score_val > 0:
                         field_scores[field_label] = int(score_val)
                 keyword_contributions.append({
@@ -586,22 +620,23 @@ async def keyword_search(bq_client: bigquery.Client, query: str, max_results: in
 
             results.append(researcher_data)
 
-        logger.info(f"✅ キーワード検索完了: {len(results)}件 (寄与度分解付き)")
-        if results and len(results) > 0:
+        logger.info("✅ キーワード検索完了: %s件 (寄与度分解付き)", len(results))
+        # INFO無効時は先頭データのログ出力処理自体を行わない
+        if results and logger.isEnabledFor(logging.INFO):
             first_result = results[0]
-            logger.info(f"🔍 キーワード検索結果の最初のデータ:")
-            logger.info(f"  - name_ja: {first_result.get('name_ja', 'N/A')}")
-            logger.info(f"  - relevance_score: {first_result.get('relevance_score', 'N/A')}")
-            logger.info(f"  - keyword_contributions: {first_result.get('keyword_contributions', 'MISSING')}")
-            logger.info(f"  - is_young_researcher: {first_result.get('is_young_researcher', 'MISSING')}")
+            logger.info("🔍 キーワード検索結果の最初のデータ:")
+            logger.info("  - name_ja: %s", first_result.get('name_ja', 'N/A'))
+            logger.info("  - relevance_score: %s", first_result.get('relevance_score', 'N/A'))
+            logger.info("  - keyword_contributions: %s", first_result.get('keyword_contributions', 'MISSING'))
+            logger.info("  - is_young_researcher: %s", first_result.get('is_young_researcher', 'MISSING'))
         return results
     except Exception as e:
-        logger.error(f"❌ キーワード検索エラー: {e}")
+        logger.error("❌ キーワード検索エラー: %s", e)
         raise
 
 async def expand_query_with_llm(query: str) -> Dict[str, Any]:
     try:
-        logger.info(f"🤖 LLMクエリ拡張開始: {query}")
+        logger.info("🤖 LLMクエリ拡張開始: %s", query)
         try:
             model = GenerativeModel("gemini-2.5-flash-lite")
             prompt = f"""あなたは学術研究データベースの検索アシスタントです。 ユーザーが入力した「元のキーワード」について、そのキーワードを含む研究情報をより効果的に見つけるために、 関連性の高い類義語、上位/下位概念語、英語の対応語（もしあれば）、具体的な技術名や物質名などを考慮し、 検索に有効そうなキーワードを最大10個提案してください。 提案は日本語の単語または短いフレーズで、カンマ区切りで出力してください。元のキーワード自体も提案に含めてください。 元のキーワード: 「{query}」 提案:"""
@@ -613,10 +648,10 @@ async def expand_query_with_llm(query: str) -> Dict[str, Any]:
                 if query not in expanded_keywords: final_keywords.append(query)
                 for kw in expanded_keywords:
                     if kw not in final_keywords: final_keywords.append(kw)
-                logger.info(f"✅ LLMクエリ拡張完了 (gemini-2.5-flash-lite): {final_keywords}")
+                logger.info("✅ LLMクエリ拡張完了 (gemini-2.5-flash-lite): %s", final_keywords)
                 return { "original_query": query, "expanded_keywords": final_keywords, "expanded_query": ' '.join(final_keywords[:5]) }
         except Exception as e:
-            logger.warning(f"⚠️ Gemini 2.5 Flash Lite失敗: {e}")
+            logger.warning("⚠️ Gemini 2.5 Flash Lite失敗: %s", e)
             try:
                 model = GenerativeModel("gemini-2.5-flash")
                 prompt = f"""研究キーワード「{query}」に関連する学術用語を5-10個提案してください。カンマ区切りで出力してください。 元のキーワード: {query} 関連キーワード:"""
@@ -626,54 +661,60 @@ async def expand_query_with_llm(query: str) -> Dict[str, Any]:
                     expanded_keywords = [kw.strip() for kw in expanded_text.split(',') if kw.strip()]
                     final_keywords = [query] if query not in expanded_keywords else []
                     final_keywords.extend([kw for kw in expanded_keywords if kw not in final_keywords])
-                    logger.info(f"✅ LLMクエリ拡張完了 (gemini-2.5-flash): {final_keywords}")
+                    logger.info("✅ LLMクエリ拡張完了 (gemini-2.5-flash): %s", final_keywords)
                     return { "original_query": query, "expanded_keywords": final_keywords, "expanded_query": ' '.join(final_keywords[:5]) }
-            except Exception as e2: logger.warning(f"⚠️ Gemini 2.5 Flash フォールバック失敗: {e2}")
+            except Exception as e2: logger.warning("⚠️ Gemini 2.5 Flash フォールバック失敗: %s", e2)
         logger.warning("⚠️ すべてのLLMモデルでクエリ拡張に失敗")
         return { "original_query": query, "expanded_keywords": [query], "expanded_query": query }
     except Exception as e:
-        logger.error(f"❌ LLMクエリ拡張エラー: {e}")
+        logger.error("❌ LLMクエリ拡張エラー: %s", e)
         return { "original_query": query, "expanded_keywords": [query], "expanded_query": query }
 
 async def add_llm_summaries(results: List[Dict], query: str) -> List[Dict]:
     try:
-        logger.info(f"🤖 LLM要約生成開始: {len(results)}名の研究者")
+        logger.info("🤖 LLM要約生成開始: %s名の研究者", len(results))
         model, model_name = None, ""
         try:
             model = GenerativeModel("gemini-2.5-flash-lite")
             model_name = "gemini-2.5-flash-lite"
-            logger.info(f"✅ 軽量LLMモデル {model_name} を使用")
+            logger.info("✅ 軽量LLMモデル %s を使用", model_name)
         except Exception as e:
-            logger.warning(f"⚠️ Gemini 2.5 Flash Lite失敗: {e}")
+            logger.warning("⚠️ Gemini 2.5 Flash Lite失敗: %s", e)
             try:
                 model = GenerativeModel("gemini-2.5-flash")
                 model_name = "gemini-2.5-flash"
-                logger.info(f"✅ LLMモデル {model_name} を使用")
+                logger.info("✅ LLMモデル %s を使用", model_name)
             except Exception as e2:
-                logger.error(f"❌ フォールバックモデル失敗: {e2}")
+                logger.error("❌ フォールバックモデル失敗: %s", e2)
                 return results
         if not model:
             logger.error("❌ 利用可能なLLMモデルがありません")
             return results
-        for idx, result in enumerate(results):
+        semaphore = asyncio.Semaphore(LLM_SUMMARY_CONCURRENCY)
+        generation_config = { "temperature": 0.1, "max_output_tokens": 200, "top_p": 0.8 }
+
+        async def summarize(result: Dict) -> None:
             try:
-                if idx > 0: time.sleep(0.5)
                 name, affiliation, keywords, fields, profile, paper, project = result.get('name_ja', ''), result.get('main_affiliation_name_ja', ''), result.get('research_keywords_ja', ''), result.get('research_fields_ja', ''), str(result.get('profile_ja', ''))[:300], result.get('paper_title_ja_first', ''), result.get('project_title_ja_first', '')
                 prompt = f"""研究者情報:\n名前: {name} ({affiliation})\n研究キーワード: {keywords}\n研究分野: {fields}\nプロフィール: {profile}\n主要論文: {paper}\n主要プロジェクト: {project}\n\n検索クエリ: 「{query}」\n\n上記の研究キーワード、プロフィール、主要論文、主要プロジェクトを踏まえて、 この研究者と検索クエリとの関連性を200字程度で分析してください。"""
-                response = model.generate_content(prompt, generation_config={ "temperature": 0.1, "max_output_tokens": 200, "top_p": 0.8 })
+                async with semaphore:
+                    response = await model.generate_content_async(prompt, generation_config=generation_config)
                 summary = response.text.strip()
                 if summary: result["llm_summary"] = summary
-                else: result["llm_summary"] = f"「{query}」に関連する研究を行っています。"
+                else: result["llm_summary"] = fallback_summary(query)
             except Exception as e:
                 error_msg = str(e)
                 if "429" in error_msg or "Resource exhausted" in error_msg:
-                    logger.warning(f"⚠️ API制限のため要約をスキップ ({result.get('name_ja', 'N/A')}): {e}")
-                    result["llm_summary"] = "⚠️ API制限のため要約をスキップしました"
+                    logger.warning("⚠️ API制限のため要約をスキップ (%s): %s", result.get('name_ja', 'N/A'), e)
+                    result["llm_summary"] = SUMMARY_RATE_LIMITED_MESSAGE
                 else:
-                    logger.warning(f"⚠️ 個別LLM要約エラー ({result.get('name_ja', 'N/A')}): {e}")
-                    result["llm_summary"] = f"「{query}」に関連する研究を行っています。"
+                    logger.warning("⚠️ 個別LLM要約エラー (%s): %s", result.get('name_ja', 'N/A'), e)
+                    result["llm_summary"] = fallback_summary(query)
+
+        # 逐次呼び出し（+0.5秒待機）ではなく、セマフォで同時実行数を制限して並列に生成する
+        await asyncio.gather(*(summarize(result) for result in results))
         logger.info("✅ LLM要約生成完了")
         return results
     except Exception as e:
-        logger.error(f"❌ LLM要約生成エラー: {e}")
+        logger.error("❌ LLM要約生成エラー: %s", e)
         return results
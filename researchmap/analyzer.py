@@ -4,12 +4,12 @@ ResearchMap API連携モジュール
 """
 
 import logging
-import json
 import re
 import asyncio
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 import aiohttp
+import orjson
 import collections
 import itertools
 from collections import Counter
@@ -57,6 +57,32 @@ TECHNICAL_KEYWORDS = {
     'ベイズ最適化', 'マテリアルズインフォマティクス'
 }
 
+# ResearchMap APIへの接続はプロセス内で共有し、TCP/TLS接続を再利用する
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 20
+HTTP_DNS_CACHE_TTL_SECONDS = 300
+
+_http_session: Optional[aiohttp.ClientSession] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """共有HTTPセッションを取得（未作成・クローズ済みの場合は作成）"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL_SECONDS
+        )
+        _http_session = aiohttp.ClientSession(connector=connector)
+    return _http_session
+
+async def close_http_session() -> None:
+    """共有HTTPセッションをクローズ（アプリケーション終了時に呼び出す）"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 
 class ResearchMapAnalyzer:
     """ResearchMap APIを使用した研究者分析クラス"""
@@ -195,57 +221,58 @@ class ResearchMapAnalyzer:
     async def fetch_researcher_data(self, researcher_id: str) -> Optional[Dict[str, Any]]:
         """ResearchMap APIから研究者情報を取得し、全論文情報も取得する"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # 基本情報の取得
-                profile_url = f"{self.api_base_url}/{researcher_id}"
-                headers = {"Accept": "application/json", "Accept-Language": "ja"}
-                timeout = aiohttp.ClientTimeout(total=15)
+            # 接続を再利用するため、リクエストごとにセッションを作らず共有セッションを使う
+            session = await get_http_session()
+            # 基本情報の取得
+            profile_url = f"{self.api_base_url}/{researcher_id}"
+            headers = {"Accept": "application/json", "Accept-Language": "ja"}
+            timeout = aiohttp.ClientTimeout(total=15)
+            
+            async with session.get(profile_url, headers=headers, timeout=timeout) as response:
+                if response.status != 200:
+                    logger.error(f"❌ ResearchMap API エラー: {response.status}")
+                    if response.status == 404 or response.status >= 500:
+                        logger.info("🔄 ResearchMap API利用不可のためモックデータを使用")
+                        return self._create_mock_researcher_data(researcher_id)
+                    return None
                 
-                async with session.get(profile_url, headers=headers, timeout=timeout) as response:
-                    if response.status != 200:
-                        logger.error(f"❌ ResearchMap API エラー: {response.status}")
-                        if response.status == 404 or response.status >= 500:
-                            logger.info("🔄 ResearchMap API利用不可のためモックデータを使用")
-                            return self._create_mock_researcher_data(researcher_id)
-                        return None
-                    
-                    data = await response.json()
-                    researcher_data = self._parse_researcher_data(data)
-                    
-                    # 全論文を取得
-                    logger.info(f"📄 {researcher_id} の全論文取得を開始...")
-                    all_papers = await self._fetch_all_papers(researcher_id, session)
-                    researcher_data["papers"] = all_papers if all_papers else researcher_data.get("papers", [])
-                    if not all_papers:
-                        logger.warning("⚠️ 全論文を取得できませんでした。基本情報に含まれる論文のみを使用します。")
-
-                    # 全その他業績(misc)を取得
-                    logger.info(f"📚 {researcher_id} の全その他業績取得を開始...")
-                    all_misc = await self._fetch_all_misc(researcher_id, session)
-
-                    # 論文とその他業績の数をカウント
-                    paper_count = len(researcher_data.get("papers", []))
-                    misc_count = 0
-
-                    if all_misc:
-                        logger.info(f"✅ 全{len(all_misc)}件のその他業績を取得完了。")
-                        # 論文とその他業績でキーが重複する可能性を考慮し、idでユニークにする
-                        existing_paper_ids = {p.get("@id") for p in researcher_data["papers"]}
-                        unique_misc = [m for m in all_misc if m.get("@id") not in existing_paper_ids]
-                        misc_count = len(unique_misc)
-                        # 業績リストにその他業績を追加
-                        researcher_data["papers"].extend(unique_misc)
-                        logger.info(f"✅ その他業績{misc_count}件を業績リストに追加。")
-                    else:
-                        logger.warning("⚠️ その他業績は取得できませんでした。")
+                data = await response.json()
+                researcher_data = self._parse_researcher_data(data)
+                
+                # 全論文を取得
+                logger.info(f"📄 {researcher_id} の全論文取得を開始...")
+                all_papers = await self._fetch_all_papers(researcher_id, session)
+                researcher_data["papers"] = all_papers if all_papers else researcher_data.get("papers", [])
+                if not all_papers:
+                    logger.warning("⚠️ 全論文を取得できませんでした。基本情報に含まれる論文のみを使用します。")
+
+                # 全その他業績(misc)を取得
+                logger.info(f"📚 {researcher_id} の全その他業績取得を開始...")
+                all_misc = await self._fetch_all_misc(researcher_id, session)
+
+                # 論文とその他業績の数をカウント
+                paper_count = len(researcher_data.get("papers", []))
+                misc_count = 0
+
+                if all_misc:
+                    logger.info(f"✅ 全{len(all_misc)}件のその他業績を取得完了。")
+                    # 論文とその他業績でキーが重複する可能性を考慮し、idでユニークにする
+                    existing_paper_ids = {p.get("@id") for p in researcher_data["papers"]}
+                    unique_misc = [m for m in all_misc if m.get("@id") not in existing_paper_ids]
+                    misc_count = len(unique_misc)
+                    # 業績リストにその他業績を追加
+                    researcher_data["papers"].extend(unique_misc)
+                    logger.info(f"✅ その他業績{misc_count}件を業績リストに追加。")
+                else:
+                    logger.warning("⚠️ その他業績は取得できませんでした。")
 
-                    # カウントを保存
-                    researcher_data["paper_count"] = paper_count
-                    researcher_data["misc_count"] = misc_count
-                    logger.info(f"📊 カウント結果: 論文={paper_count}件, その他業績={misc_count}件, 合計={len(researcher_data['papers'])}件")
+                # カウントを保存
+                researcher_data["paper_count"] = paper_count
+                researcher_data["misc_count"] = misc_count
+                logger.info(f"📊 カウント結果: 論文={paper_count}件, その他業績={misc_count}件, 合計={len(researcher_data['papers'])}件")
 
-                    return researcher_data
-                    
+                return researcher_data
+                
         except asyncio.TimeoutError:
             logger.warning("⚠️ ResearchMap APIタイムアウト - モックデータを使用")
             return self._create_mock_researcher_data(researcher_id)
@@ -601,8 +628,9 @@ class ResearchMapAnalyzer:
         key_projects = []
         
         for i, project in enumerate(projects[:limit]):  # 最新のものから
-            # デバッグ: プロジェクト全体の構造を確認
-            logger.info(f"プロジェクト{i+1}のデータ構造: {json.dumps(project, ensure_ascii=False, indent=2)[:500]}...")
+            # デバッグ: プロジェクト全体の構造を確認（整形処理はDEBUG有効時のみ行う）
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("プロジェクト%sのデータ構造: %s...", i + 1, orjson.dumps(project, option=orjson.OPT_INDENT_2).decode("utf-8")[:500])
             
             # タイトルの取得 - ResearchMap APIの実際のフィールド名に対応
             # research_project_title または project_title の両方に対応
@@ -1553,7 +1581,7 @@ Frequent Word 2; 80
                 response_text = response_text[json_start:json_end].strip()
             
             # JSONパース
-            scores = json.loads(response_text)
+            scores = orjson.loads(response_text)
             
             # スコアの範囲チェックと型変換
             scores["technical_relevance"] = int(min(40, max(0, scores.get("technical_relevance", 0))))
@@ -0,0 +1,26 @@
+"""
+project_manager モジュールの読み込みとモデル構築の確認
+"""
+
+import pytest
+
+pydantic = pytest.importorskip("pydantic")
+pytest.importorskip("google.cloud.bigquery")
+
+import project_manager
+
+
+def test_temp_project_defaults_to_draft():
+    project = project_manager.TempProject(
+        id="temp_1",
+        name="テストプロジェクト",
+        description="説明",
+        created_at="2026-01-01T00:00:00",
+    )
+    assert project.status == "draft"
+    assert project.selected_researchers == []
+
+
+def test_status_update_rejects_unknown_status():
+    with pytest.raises(pydantic.ValidationError):
+        project_manager.ProjectStatusUpdate(status="unknown")
@@ -0,0 +1,10 @@
+"""
+gunicorn から起動する際の uvicorn ワーカー設定
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class QuietUvicornWorker(UvicornWorker):
+    """リクエストごとのアクセスログを出力しない uvicorn ワーカー（各エンドポイントが自前で要約ログを出すため）"""
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "access_log": False}